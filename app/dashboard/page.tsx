@@ -23,7 +23,7 @@ export default function DashboardPage() {
     isRefreshEnabled ? 15000 : 0
   );
   const { healthData } = useHealthData(isRefreshEnabled ? 20000 : 0);
-  const { disruptions } = useDisruptions(isRefreshEnabled ? 15000 : 0);
+  const { disruptions } = useDisruptions(isRefreshEnabled ? 15000 : 0, trainData);
 
   const onTimeTrains = trainData.filter(t => t.train.status === 'On time').length;
   const delayedTrains = trainData.filter(t => t.train.status === 'Delayed').length;
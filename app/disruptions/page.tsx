@@ -5,13 +5,15 @@ import Link from 'next/link';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import NotificationBell from '@/components/NotificationBell';
+import useTrainData from '@/hooks/useTrainData';
 import useDisruptions from '@/hooks/useDisruptions';
 import { getDisruptionSeverityColor } from '@/lib/utils';
 import { Train, AlertTriangle, Wrench, Construction, AlertCircle, CheckCircle, Clock, Activity, Filter } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
 
 export default function DisruptionsPage() {
-  const { disruptions, isLoading } = useDisruptions();
+  const { trainData } = useTrainData();
+  const { disruptions, isLoading } = useDisruptions(undefined, trainData);
   const [activeTab, setActiveTab] = useState('all');
 
   const getSeverityIcon = (severity: string) => {
@@ -378,6 +380,38 @@ export default function DisruptionsPage() {
                           )}
                         </div>
                       </div>
+
+                      {/* Reroute Options */}
+                      {disruption.reroute_options && disruption.reroute_options.length > 0 && (
+                        <div className="mt-8">
+                          <h4 className="font-semibold text-gray-900 mb-4 flex items-center gap-2">
+                            <Activity className="w-4 h-4" />
+                            Reroute Options
+                          </h4>
+                          <div className="space-y-3">
+                            {disruption.reroute_options.map((option) => (
+                              <div
+                                key={`${option.from_station}-${option.to_station}`}
+                                className="flex items-center justify-between bg-blue-50 p-3 rounded-lg border border-blue-200"
+                              >
+                                <div>
+                                  <span className="font-semibold text-gray-900">
+                                    {option.from_station} → {option.to_station}
+                                  </span>
+                                  <span className="text-sm text-gray-600 ml-2">
+                                    via {option.sections.join(' → ')} ({option.length_km} km)
+                                  </span>
+                                </div>
+                                {option.train_ids.length > 0 && (
+                                  <span className="text-sm text-blue-700 bg-blue-100 px-3 py-1 rounded-lg font-medium">
+                                    {option.train_ids.join(', ')}
+                                  </span>
+                                )}
+                              </div>
+                            ))}
+                          </div>
+                        </div>
+                      )}
                       
                       {/* Progress Bar */}
                       <div className="mt-8">
@@ -18,7 +18,7 @@ import {
 export default function HealthPage() {
   const { healthData, isLoading: healthLoading } = useHealthData();
   const { trainData } = useTrainData();
-  const { disruptions } = useDisruptions();
+  const { disruptions } = useDisruptions(undefined, trainData);
 
   const getHealthStatusColor = (status: string) => {
     switch (status.toLowerCase()) {
@@ -372,6 +372,33 @@ export default function HealthPage() {
                 </div>
               </div>
 
+              {/* Optimization Cycle */}
+              {healthData.optimization && (
+                <div>
+                  <h4 className="font-medium text-gray-900 mb-3">Optimization Cycle</h4>
+                  <div className="space-y-2">
+                    {Object.entries(healthData.optimization.stages).map(([stage, stats]) => (
+                      <div key={stage} className="flex justify-between items-center text-sm">
+                        <span className="text-gray-600">{stage.replace(/_/g, ' ')}</span>
+                        <span className="font-medium">p50 {stats.p50_ms}ms · p99 {stats.p99_ms}ms</span>
+                      </div>
+                    ))}
+                    <div className="flex justify-between items-center text-sm pt-2 border-t border-gray-100">
+                      <span className="text-gray-600">Cycles / skipped</span>
+                      <span className="font-medium">
+                        {healthData.optimization.cycles_total} / {healthData.optimization.skipped_cycles_total}
+                      </span>
+                    </div>
+                    <div className="flex justify-between items-center text-sm">
+                      <span className="text-gray-600">LLM fallbacks / parse failures</span>
+                      <span className="font-medium">
+                        {healthData.optimization.llm_fallbacks_total} / {healthData.optimization.llm_parse_failures_total}
+                      </span>
+                    </div>
+                  </div>
+                </div>
+              )}
+
               {/* System Health Score */}
               <div>
                 <h4 className="font-medium text-gray-900 mb-3">Overall Health Score</h4>
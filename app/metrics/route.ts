@@ -0,0 +1,54 @@
+import { NextResponse } from 'next/server';
+import { renderPrometheus, sanitizeSnapshot, MetricsSnapshot } from '@/lib/metrics';
+
+// Prometheus scrape target for the optimization engine. The engine runs in the
+// browser, so each session POSTs its metrics snapshot after every cycle and GET
+// renders the latest snapshot of every live session, labelled by instance.
+
+export const dynamic = 'force-dynamic';
+
+const STALE_AFTER_MS = 5 * 60 * 1000;
+const MAX_INSTANCES = 100;
+const INSTANCE_ID = /^[a-z0-9]{1,32}$/;
+
+const instances = new Map<string, { snapshot: MetricsSnapshot; receivedAt: number }>();
+
+const pruneStale = () => {
+  const cutoff = Date.now() - STALE_AFTER_MS;
+  instances.forEach((entry, instance) => {
+    if (entry.receivedAt < cutoff) instances.delete(instance);
+  });
+};
+
+export async function GET() {
+  pruneStale();
+  const sources = Array.from(instances.entries()).map(([instance, entry]) => ({
+    snapshot: entry.snapshot,
+    labels: { instance },
+  }));
+  return new NextResponse(renderPrometheus(sources), {
+    headers: { 'Content-Type': 'text/plain; version=0.0.4; charset=utf-8' },
+  });
+}
+
+export async function POST(request: Request) {
+  try {
+    const body = await request.json();
+    const instance = body?.instance;
+    // The endpoint is unauthenticated: everything rendered into the exposition
+    // text has to pass validation first
+    const snapshot = sanitizeSnapshot(body?.snapshot);
+    if (typeof instance !== 'string' || !INSTANCE_ID.test(instance) || !snapshot) {
+      return NextResponse.json({ error: 'Invalid metrics snapshot' }, { status: 400 });
+    }
+
+    pruneStale();
+    if (!instances.has(instance) && instances.size >= MAX_INSTANCES) {
+      return NextResponse.json({ error: 'Too many metrics instances' }, { status: 429 });
+    }
+    instances.set(instance, { snapshot, receivedAt: Date.now() });
+    return NextResponse.json({ success: true });
+  } catch (error) {
+    return NextResponse.json({ error: 'Invalid metrics snapshot' }, { status: 400 });
+  }
+}
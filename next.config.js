@@ -5,6 +5,13 @@ const nextConfig = {
   images: {
     domains: ['localhost'],
   },
+  // Lets the optimization engine pages start JS Self-Profiling sessions for slow cycles
+  async headers() {
+    return ['/optimization-engine', '/optimization-engine/:path*'].map(source => ({
+      source,
+      headers: [{ key: 'Document-Policy', value: 'js-profiling' }],
+    }));
+  },
 }
 
 module.exports = nextConfig
\ No newline at end of file
@@ -0,0 +1,272 @@
+// Benchmark harness for the decision pipeline (the stages of decision_taker.py optimize_traffic).
+//
+// Serves seeded synthetic /api/train-data payloads from a local stand-in server, runs each
+// pipeline stage against them and writes per-stage latency percentiles, throughput and peak
+// memory to a JSON file that can be diffed between commits.
+//
+// Usage: npm run bench -- --sizes=10,100,1000,10000 --iterations=10 --seed=42 --out=bench_output.json
+
+import http from 'http';
+import { AddressInfo } from 'net';
+import { writeFileSync } from 'fs';
+import { execSync } from 'child_process';
+import { performance } from 'perf_hooks';
+import axios from 'axios';
+import { TrainBundle } from '@/types';
+import { loadTopology, Topology } from '@/lib/topology';
+import { ConflictAnalyzer } from '@/lib/conflictAnalyzer';
+import { projectConflicts } from '@/lib/conflictProjection';
+import { createOptimizationPrompt } from '@/lib/optimizationPrompt';
+import { solveSchedule } from '@/lib/scheduleSolver';
+import { solvePartitioned, partitionTopology, RegionSolverPool } from '@/lib/networkPartition';
+import { generateFallbackSchedule, generateIntelligentFallbackSchedule } from '@/lib/fallbackSchedules';
+import { ScheduleStore, StorageLike } from '@/lib/scheduleStore';
+import { generateSyntheticNetwork, createRandom } from '@/lib/syntheticNetwork';
+import { DisruptionIndex } from '@/lib/disruptionIndex';
+
+interface BenchmarkOptions {
+  sizes: number[];
+  iterations: number;
+  seed: number;
+  out: string;
+  solverBudgetMs: number;
+  skip: string[];
+}
+
+interface StageStats {
+  samples: number;
+  mean_ms: number;
+  p50_ms: number;
+  p90_ms: number;
+  p99_ms: number;
+  max_ms: number;
+  trains_per_s: number;
+}
+
+const parseArgs = (argv: string[]): BenchmarkOptions => {
+  const args: Record<string, string> = {};
+  argv.forEach(arg => {
+    const match = arg.match(/^--([^=]+)=(.*)$/);
+    if (match) args[match[1]] = match[2];
+  });
+  return {
+    sizes: (args.sizes || '10,100,1000,10000').split(',').map(Number),
+    iterations: Number(args.iterations || 10),
+    seed: Number(args.seed || 42),
+    out: args.out || 'bench_output.json',
+    solverBudgetMs: Number(args['solver-budget-ms'] || 250),
+    skip: args.skip ? args.skip.split(',') : [],
+  };
+};
+
+const percentile = (sorted: number[], p: number): number =>
+  sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)];
+
+const round = (value: number) => Math.round(value * 1000) / 1000;
+
+const summarize = (samples: number[], trains: number): StageStats => {
+  const sorted = samples.slice().sort((a, b) => a - b);
+  const mean = sorted.reduce((sum, value) => sum + value, 0) / sorted.length;
+  return {
+    samples: sorted.length,
+    mean_ms: round(mean),
+    p50_ms: round(percentile(sorted, 50)),
+    p90_ms: round(percentile(sorted, 90)),
+    p99_ms: round(percentile(sorted, 99)),
+    max_ms: round(sorted[sorted.length - 1]),
+    trains_per_s: mean > 0 ? Math.round(trains / (mean / 1000)) : 0,
+  };
+};
+
+// In-memory stand-in for localStorage so the schedule store can run under Node
+const memoryStorage = (): StorageLike => {
+  const data = new Map<string, string>();
+  return {
+    getItem: key => data.get(key) ?? null,
+    setItem: (key, value) => { data.set(key, value); },
+    removeItem: key => { data.delete(key); },
+  };
+};
+
+// Runs region batches one after another on this thread
+const sequentialPool: RegionSolverPool = {
+  size: 4,
+  solve: (topology, { trains, options }) => Promise.resolve(solveSchedule(trains, topology, options)),
+};
+
+// Local stand-in for GET /api/train-data serving a pre-serialized payload
+const startTrainDataServer = (trains: TrainBundle[]): Promise<{ url: string; close: () => void }> => {
+  const body = JSON.stringify({ payload: trains });
+  const server = http.createServer((req, res) => {
+    if (req.url === '/api/train-data') {
+      res.writeHead(200, { 'Content-Type': 'application/json' });
+      res.end(body);
+    } else {
+      res.writeHead(404);
+      res.end();
+    }
+  });
+  return new Promise(resolve => {
+    server.listen(0, '127.0.0.1', () => {
+      const { port } = server.address() as AddressInfo;
+      resolve({ url: `http://127.0.0.1:${port}`, close: () => server.close() });
+    });
+  });
+};
+
+// Move ~1% of active trains one section downstream, as between two polls
+const advanceTrains = (trains: TrainBundle[], topology: Topology, random: () => number): TrainBundle[] =>
+  trains.map(bundle => {
+    if (random() >= 0.01) return bundle;
+    const slot = topology.sectionIndex.get(bundle.train.current_location.section_id);
+    const next = slot === undefined ? undefined : topology.next[slot][0];
+    if (next === undefined) return bundle;
+    return {
+      ...bundle,
+      train: {
+        ...bundle.train,
+        current_location: { section_id: topology.sections[next].section_id, position_m: 0 },
+      },
+    };
+  });
+
+const runSize = async (trainCount: number, options: BenchmarkOptions) => {
+  const network = generateSyntheticNetwork({ trains: trainCount, seed: options.seed });
+  const topology = loadTopology(network.topology);
+  const server = await startTrainDataServer(network.trains);
+  const random = createRandom(options.seed);
+  const samples: Record<string, number[]> = {};
+  let peakHeap = 0;
+  let peakRss = 0;
+
+  const record = (stage: string, elapsed: number) => {
+    (samples[stage] = samples[stage] || []).push(elapsed);
+    const memory = process.memoryUsage();
+    peakHeap = Math.max(peakHeap, memory.heapUsed);
+    peakRss = Math.max(peakRss, memory.rss);
+  };
+
+  const time = <T>(stage: string, fn: () => T): T | undefined => {
+    if (options.skip.includes(stage)) return undefined;
+    const start = performance.now();
+    const result = fn();
+    record(stage, performance.now() - start);
+    return result;
+  };
+
+  const timeAsync = async <T>(stage: string, fn: () => Promise<T>): Promise<T | undefined> => {
+    if (options.skip.includes(stage)) return undefined;
+    const start = performance.now();
+    const result = await fn();
+    record(stage, performance.now() - start);
+    return result;
+  };
+
+  try {
+    for (let i = 0; i < options.iterations; i++) {
+      const fetchStart = performance.now();
+      const response = await axios.get(`${server.url}/api/train-data`);
+      const trains: TrainBundle[] = response.data.payload;
+      record('fetch', performance.now() - fetchStart);
+
+      const analyzer = new ConflictAnalyzer(topology);
+      const conflicts = time('analyze_conflicts', () => {
+        analyzer.update(trains);
+        return analyzer.conflicts();
+      }) || [];
+
+      const advanced = advanceTrains(trains, topology, random);
+      time('analyze_conflicts_incremental', () => {
+        analyzer.update(advanced);
+        return analyzer.conflicts();
+      });
+
+      const predicted = time('conflict_projection', () => projectConflicts(trains, topology, { horizonS: 3600 })) || [];
+
+      // The engine only forwards the 20 soonest predicted conflicts to the prompt
+      time('prompt_build', () => createOptimizationPrompt(trains, conflicts, topology, predicted.slice(0, 20)));
+      const schedule = time('solver', () =>
+        solveSchedule(trains, topology, { timeBudgetMs: options.solverBudgetMs })
+      ) || generateFallbackSchedule(trains);
+      // Batches run back to back here, so this measures partition and merge overhead
+      // plus the largest batch's solve time rather than wall-clock parallel speedup
+      await timeAsync('solver_partitioned', () =>
+        solvePartitioned(trains, topology, { timeBudgetMs: options.solverBudgetMs, pool: sequentialPool, minParallelTrains: 0 })
+      );
+      time('fallback', () => generateFallbackSchedule(trains));
+      time('fallback_intelligent', () => generateIntelligentFallbackSchedule(trains, conflicts, topology.sectionCapacity));
+
+      const store = new ScheduleStore(memoryStorage());
+      time('serialize', () => store.append(schedule));
+
+      // Index build plus one new disruption on top of the sections already disrupted
+      const disruptionIndex = new DisruptionIndex(topology);
+      const disrupted = trains.filter(bundle => bundle.section.is_disrupted).map(bundle => bundle.section.section_id);
+      time('disruption_index', () => {
+        disruptionIndex.updateTrains(trains);
+        disruptionIndex.updateSchedule(schedule);
+        disruptionIndex.setDisrupted(disrupted);
+      });
+      const newDisruption = topology.sections[Math.floor(random() * topology.sections.length)].section_id;
+      time('disruption_impact', () => {
+        disruptionIndex.setDisrupted(disrupted.concat(newDisruption));
+        return [disruptionIndex.affectedTrains(newDisruption), disruptionIndex.rerouteOptions(newDisruption)];
+      });
+    }
+  } finally {
+    server.close();
+  }
+
+  const stages: Record<string, StageStats> = {};
+  Object.keys(samples).sort().forEach(stage => {
+    stages[stage] = summarize(samples[stage], trainCount);
+  });
+
+  return {
+    trains: trainCount,
+    sections: topology.sections.length,
+    regions: partitionTopology(topology).regionCount,
+    peak_heap_mb: round(peakHeap / 1024 / 1024),
+    peak_rss_mb: round(peakRss / 1024 / 1024),
+    stages,
+  };
+};
+
+const gitCommit = (): string | null => {
+  try {
+    return execSync('git rev-parse --short HEAD', { stdio: ['ignore', 'pipe', 'ignore'] }).toString().trim();
+  } catch {
+    return null;
+  }
+};
+
+const main = async () => {
+  const options = parseArgs(process.argv.slice(2));
+  const results = [];
+
+  for (const size of options.sizes) {
+    console.log(`Benchmarking ${size} trains (${options.iterations} iterations)...`);
+    const result = await runSize(size, options);
+    Object.entries(result.stages).forEach(([stage, stats]) => {
+      console.log(`  ${(stage + ' '.repeat(30)).slice(0, 30)} p50 ${stats.p50_ms}ms  p99 ${stats.p99_ms}ms  ${stats.trains_per_s} trains/s`);
+    });
+    console.log(`  peak heap ${result.peak_heap_mb}MB, peak rss ${result.peak_rss_mb}MB`);
+    results.push(result);
+  }
+
+  const report = {
+    commit: gitCommit(),
+    node: process.version,
+    seed: options.seed,
+    iterations: options.iterations,
+    solver_budget_ms: options.solverBudgetMs,
+    results,
+  };
+  writeFileSync(options.out, `${JSON.stringify(report, null, 2)}\n`);
+  console.log(`Benchmark results written to ${options.out}`);
+};
+
+main().catch(error => {
+  console.error('Benchmark failed:', error);
+  process.exit(1);
+});
@@ -0,0 +1,418 @@
+// Consistency checks for the pipeline libraries.
+//
+// Each check compares an optimized code path with a straightforward reference or
+// asserts an invariant of its output. The script exits non-zero if any check fails,
+// so it can gate changes the way the benchmark tracks their cost.
+//
+// Usage: npm run check
+
+import assert from 'assert';
+import { TrainBundle, Conflict, OptimizationSchedule } from '@/types';
+import { loadTopology, Topology } from '@/lib/topology';
+import { ConflictAnalyzer } from '@/lib/conflictAnalyzer';
+import { projectConflicts } from '@/lib/conflictProjection';
+import { solveSchedule, buildSectionTables } from '@/lib/scheduleSolver';
+import { solvePartitioned, RegionSolverPool } from '@/lib/networkPartition';
+import { DisruptionIndex } from '@/lib/disruptionIndex';
+import { ScheduleStore, StorageLike } from '@/lib/scheduleStore';
+import { generateSyntheticNetwork, createRandom } from '@/lib/syntheticNetwork';
+
+interface Check {
+  name: string;
+  run: () => void | Promise<void>;
+}
+
+const checks: Check[] = [];
+const check = (name: string, run: () => void | Promise<void>) => {
+  checks.push({ name, run });
+};
+
+// In-memory stand-in for localStorage; setItem throws once `quotaBytes` is exceeded
+const memoryStorage = (quotaBytes = Infinity) => {
+  const data = new Map<string, string>();
+  const writes: Array<{ key: string; bytes: number }> = [];
+  const used = () => Array.from(data.values()).reduce((total, value) => total + value.length, 0);
+  const storage: StorageLike & { data: Map<string, string>; writes: typeof writes } = {
+    data,
+    writes,
+    getItem: key => data.get(key) ?? null,
+    setItem: (key, value) => {
+      if (used() - (data.get(key)?.length ?? 0) + value.length > quotaBytes) {
+        throw new Error('QuotaExceededError');
+      }
+      data.set(key, value);
+      writes.push({ key, bytes: value.length });
+    },
+    removeItem: key => { data.delete(key); },
+    get length() { return data.size; },
+    key: index => Array.from(data.keys())[index] ?? null,
+  };
+  return storage;
+};
+
+const scheduleAt = (ts: number, trains = 3): OptimizationSchedule => {
+  const schedule: OptimizationSchedule = { now_epoch_s: ts, horizon_s: 3600, snapshot_trains_considered: trains, schedule: {} };
+  for (let t = 0; t < trains; t++) {
+    schedule.schedule[`T${t}`] = {
+      target_section: `SEC_${t}`,
+      entry_offset_s: t * 10,
+      entry_epoch_s: ts + t * 10,
+      action: 'proceed',
+      priority: 3,
+      status: 'On time',
+    };
+  }
+  return schedule;
+};
+
+const storedTimes = (store: ScheduleStore, query = {}) => store.query(query).map(record => record.schedule.now_epoch_s);
+
+check('schedule store: queries return records oldest first after out-of-order appends', () => {
+  const store = new ScheduleStore(memoryStorage());
+  [100, 300, 200, 400, 250].forEach(ts => store.append(scheduleAt(ts)));
+  assert.deepStrictEqual(storedTimes(store), [100, 200, 250, 300, 400]);
+  assert.deepStrictEqual(storedTimes(store, { from: 150, to: 320 }), [200, 250, 300]);
+  assert.strictEqual(store.latest()?.now_epoch_s, 250);
+});
+
+check('schedule store: appends write only the new record', () => {
+  const storage = memoryStorage();
+  const store = new ScheduleStore(storage, { segmentRecords: 50 });
+  for (let i = 0; i < 200; i++) store.append(scheduleAt(1000 + i * 20));
+
+  const sum = (writes: typeof storage.writes) => writes.reduce((total, write) => total + write.bytes, 0);
+  const segmentWrites = storage.writes.filter(write => /_seg_\d+/.test(write.key));
+  const recordBytes = sum(segmentWrites.filter(write => /_seg_\d+_\d+$/.test(write.key)));
+  // Each record is written once on append and once more when its segment is sealed
+  assert.ok(
+    sum(segmentWrites) <= 2 * recordBytes + segmentWrites.length,
+    `wrote ${sum(segmentWrites)} segment bytes for ${recordBytes} bytes of records`
+  );
+  assert.strictEqual(storedTimes(store).length, 200);
+});
+
+check('schedule store: retention expires records in the active segment', () => {
+  const storage = memoryStorage();
+  const store = new ScheduleStore(storage, { retentionS: 1000, maxSegments: 2 });
+  [0, 500, 1200].forEach(ts => store.append(scheduleAt(ts)));
+  assert.deepStrictEqual(storedTimes(store), [500, 1200]);
+
+  store.append(scheduleAt(5000));
+  assert.deepStrictEqual(storedTimes(store), [5000]);
+  const segmentKeys = Array.from(storage.data.keys()).filter(key => key.indexOf('_seg_') !== -1);
+  assert.strictEqual(segmentKeys.length, 1, `expired segments left behind: ${segmentKeys.join(', ')}`);
+});
+
+check('schedule store: a full quota evicts old segments instead of failing', () => {
+  const storage = memoryStorage(40 * 1024);
+  const store = new ScheduleStore(storage, { segmentRecords: 10 });
+  for (let i = 0; i < 300; i++) {
+    assert.ok(store.append(scheduleAt(1000 + i * 20, 10)), `append ${i} failed`);
+  }
+  assert.strictEqual(store.latest()?.now_epoch_s, 1000 + 299 * 20);
+  const times = storedTimes(store);
+  assert.deepStrictEqual(times, times.slice().sort((a, b) => a - b));
+});
+
+const INACTIVE_STATUSES = ['Arrived', 'Cancelled'];
+const DEFAULT_SPEED_KMH = 100;
+const DEFAULT_HEADWAY_S = 120;
+
+const syntheticNetwork = (trainCount: number, seed: number) => {
+  const network = generateSyntheticNetwork({ trains: trainCount, seed });
+  return { topology: loadTopology(network.topology), trains: network.trains };
+};
+
+const isActive = (bundle: TrainBundle) => !INACTIVE_STATUSES.includes(bundle.train.status);
+
+// One poll's worth of churn: some trains move a section, change status or leave,
+// and a few new trains appear
+const churn = (trains: TrainBundle[], topology: Topology, random: () => number, step: number) => {
+  const upserts: TrainBundle[] = [];
+  const removed: string[] = [];
+  const next: TrainBundle[] = [];
+  trains.forEach(bundle => {
+    const roll = random();
+    if (roll < 0.02) {
+      removed.push(bundle.train.train_id);
+      return;
+    }
+    if (roll < 0.1) {
+      const slot = topology.sectionIndex.get(bundle.train.current_location.section_id)!;
+      const neighbours = bundle.train.direction === 'backward' ? topology.prev[slot] : topology.next[slot];
+      const target = neighbours.length > 0 ? neighbours[0] : slot;
+      bundle = {
+        ...bundle,
+        train: {
+          ...bundle.train,
+          status: roll < 0.03 ? 'Arrived' : bundle.train.status,
+          current_location: { section_id: topology.sections[target].section_id, position_m: 0 },
+        },
+      };
+      upserts.push(bundle);
+    }
+    next.push(bundle);
+  });
+  for (let i = 0; i < 3; i++) {
+    const template = trains[Math.floor(random() * trains.length)];
+    const bundle = { ...template, train: { ...template.train, train_id: `NEW_${step}_${i}`, status: 'On time' } };
+    upserts.push(bundle);
+    next.push(bundle);
+  }
+  return { trains: next, upserts, removed };
+};
+
+const normalizeConflicts = (conflicts: Conflict[]): string[] =>
+  conflicts.map(conflict => JSON.stringify({
+    ...conflict,
+    current_trains: conflict.current_trains?.slice().sort(),
+    occupied_by: conflict.occupied_by?.slice().sort(),
+    approaching: conflict.approaching?.slice().sort(),
+  })).sort();
+
+check('conflict analyzer: incremental updates match a full re-analysis', () => {
+  const { topology, trains: initial } = syntheticNetwork(600, 7);
+  const random = createRandom(7);
+  const incremental = new ConflictAnalyzer(topology);
+  incremental.update(initial);
+
+  let trains = initial;
+  for (let step = 0; step < 25; step++) {
+    const changes = churn(trains, topology, random, step);
+    trains = changes.trains;
+    // Alternate between stream deltas and full snapshots, as the engine does
+    if (step % 3 === 2) incremental.update(trains);
+    else incremental.applyChanges(changes.upserts, changes.removed);
+
+    const full = new ConflictAnalyzer(topology);
+    full.update(trains);
+    assert.deepStrictEqual(normalizeConflicts(incremental.conflicts()), normalizeConflicts(full.conflicts()), `step ${step}`);
+    assert.strictEqual(incremental.trainCount, full.trainCount, `step ${step}`);
+  }
+});
+
+// Straightforward projection: walk each train section by section, then compare
+// every entry with all earlier entries into the same section
+const referenceProjection = (trains: TrainBundle[], topology: Topology, horizonS: number): string[] => {
+  const { headway, speed } = buildSectionTables(trains);
+  const bySection: Record<string, Array<{ trainId: string; start: number; end: number }>> = {};
+  trains.filter(isActive).forEach(bundle => {
+    const train = bundle.train;
+    let slot = topology.sectionIndex.get(train.current_location?.section_id);
+    if (slot === undefined) return;
+    const forward = train.direction !== 'backward';
+    const position = train.current_location.position_m || 0;
+    let remainingM = forward ? topology.lengthKm[slot] * 1000 - position : position;
+    let clock = 0;
+    for (let hop = 0; hop < 64 && clock < horizonS; hop++) {
+      const sectionId = topology.sections[slot].section_id;
+      const speedMs = Math.min(train.max_speed_kmh || DEFAULT_SPEED_KMH, speed[sectionId] || Infinity) / 3.6;
+      const exit = clock + Math.max(0, remainingM) / Math.max(speedMs, 0.1);
+      (bySection[sectionId] = bySection[sectionId] || []).push({ trainId: train.train_id, start: clock, end: exit });
+      const neighbours: number[] = forward ? topology.next[slot] : topology.prev[slot];
+      if (neighbours.length === 0) break;
+      slot = neighbours[0];
+      remainingM = topology.lengthKm[slot] * 1000;
+      clock = exit;
+    }
+  });
+
+  const found: string[] = [];
+  Object.keys(bySection).forEach(sectionId => {
+    const entries = bySection[sectionId].slice().sort((a, b) => a.start - b.start);
+    const capacity = topology.sectionCapacity[sectionId];
+    const padding = headway[sectionId] ?? DEFAULT_HEADWAY_S;
+    let inConflict = false;
+    entries.forEach((entry, i) => {
+      const occupying = entries.slice(0, i).filter(other => other.end + padding > entry.start);
+      if (occupying.length + 1 <= capacity) {
+        inConflict = false;
+        return;
+      }
+      if (inConflict || entry.start <= 0) return;
+      inConflict = true;
+      found.push(`${sectionId}|${Math.round(entry.start)}|${entry.trainId}|${occupying.map(other => other.trainId).sort().join(',')}`);
+    });
+  });
+  return found.sort();
+};
+
+check('conflict projection: interval sweep matches a pairwise reference', () => {
+  [50, 400, 1500].forEach(trainCount => {
+    const { topology, trains } = syntheticNetwork(trainCount, 11);
+    const conflicts = projectConflicts(trains, topology, { horizonS: 3600 });
+    const swept = conflicts
+      .map(conflict => `${conflict.section}|${conflict.time_to_conflict_s}|${conflict.approaching![0]}|${conflict.occupied_by!.slice().sort().join(',')}`)
+      .sort();
+    assert.deepStrictEqual(swept, referenceProjection(trains, topology, 3600), `${trainCount} trains`);
+    const times = conflicts.map(conflict => conflict.time_to_conflict_s!);
+    assert.deepStrictEqual(times, times.slice().sort((a, b) => a - b), 'not ordered by time_to_conflict_s');
+  });
+});
+
+// Capacity, headway and exit-before-entry violations in a solver schedule. Each
+// train holds its current section until it exits and its target section for the
+// traversal time; sections already over capacity at snapshot time are only
+// reported when a scheduled entry adds to them.
+const scheduleViolations = (trains: TrainBundle[], topology: Topology, schedule: OptimizationSchedule): string[] => {
+  const { headway, speed } = buildSectionTables(trains);
+  const travel = (train: TrainBundle['train'], sectionId: string, distanceM: number) => {
+    const speedKmh = Math.min(train.max_speed_kmh || DEFAULT_SPEED_KMH, speed[sectionId] || Infinity);
+    return Math.round(Math.max(0, distanceM) / (Math.max(1, speedKmh) / 3.6));
+  };
+
+  const violations: string[] = [];
+  const bySection: Record<string, Array<{ start: number; end: number; seeded: boolean; trainId: string }>> = {};
+  const add = (sectionId: string, start: number, end: number, seeded: boolean, trainId: string) => {
+    (bySection[sectionId] = bySection[sectionId] || []).push({ start, end, seeded, trainId });
+  };
+
+  trains.filter(isActive).forEach(bundle => {
+    const train = bundle.train;
+    const current = train.current_location.section_id;
+    const lengthM = topology.sectionGraph[current].length_km * 1000;
+    const position = train.current_location.position_m || 0;
+    const exit = travel(train, current, train.direction === 'backward' ? position : lengthM - position);
+    add(current, 0, exit, true, train.train_id);
+
+    const entry = schedule.schedule[train.train_id];
+    if (!entry) {
+      violations.push(`${train.train_id} missing from the schedule`);
+      return;
+    }
+    if (entry.target_section === current) return;
+    if (entry.entry_offset_s < exit) {
+      violations.push(`${train.train_id} enters ${entry.target_section} at ${entry.entry_offset_s}s before leaving ${current} at ${exit}s`);
+    }
+    const traversal = Math.max(1, travel(train, entry.target_section, topology.sectionGraph[entry.target_section].length_km * 1000));
+    add(entry.target_section, entry.entry_offset_s, entry.entry_offset_s + traversal, false, train.train_id);
+  });
+
+  Object.keys(bySection).forEach(sectionId => {
+    const intervals = bySection[sectionId];
+    const gap = headway[sectionId] ?? DEFAULT_HEADWAY_S;
+    const entries = intervals.filter(interval => !interval.seeded).sort((a, b) => a.start - b.start);
+    for (let i = 1; i < entries.length; i++) {
+      if (entries[i].start - entries[i - 1].start < gap) {
+        violations.push(`${sectionId}: ${entries[i - 1].trainId} and ${entries[i].trainId} enter ${entries[i].start - entries[i - 1].start}s apart (headway ${gap}s)`);
+      }
+    }
+
+    // Sweep [start, end) intervals; ends sort before starts at the same instant
+    const capacity = topology.sectionCapacity[sectionId] || 1;
+    const events: Array<[number, number, boolean]> = [];
+    intervals.forEach(interval => {
+      events.push([interval.start, 1, interval.seeded], [interval.end, -1, interval.seeded]);
+    });
+    events.sort((a, b) => a[0] - b[0] || a[1] - b[1]);
+    let occupied = 0;
+    let scheduled = 0;
+    events.forEach(([time, delta, seeded]) => {
+      occupied += delta;
+      if (!seeded) scheduled += delta;
+      if (delta > 0 && scheduled > 0 && occupied > capacity) {
+        violations.push(`${sectionId}: ${occupied} trains at ${time}s (capacity ${capacity})`);
+      }
+    });
+  });
+  return violations;
+};
+
+check('schedule solver: no capacity, headway or exit violations', () => {
+  [30, 500, 3000].forEach(trainCount => {
+    const { topology, trains } = syntheticNetwork(trainCount, 3);
+    const nowEpochS = 1758607200;
+    const cold = solveSchedule(trains, topology, { nowEpochS, timeBudgetMs: 10000 });
+    assert.deepStrictEqual(scheduleViolations(trains, topology, cold).slice(0, 5), [], `${trainCount} trains, cold start`);
+
+    // Warm start from a schedule after a round of churn
+    const random = createRandom(trainCount);
+    const moved = churn(trains, topology, random, 0).trains;
+    const warm = solveSchedule(moved, topology, { nowEpochS, timeBudgetMs: 10000, previousSchedule: cold });
+    assert.deepStrictEqual(scheduleViolations(moved, topology, warm).slice(0, 5), [], `${trainCount} trains, warm start`);
+
+    // An exhausted budget queues every train, which must stay feasible
+    const queued = solveSchedule(trains, topology, { nowEpochS, timeBudgetMs: -1 });
+    assert.deepStrictEqual(scheduleViolations(trains, topology, queued).slice(0, 5), [], `${trainCount} trains, queued`);
+  });
+});
+
+// Runs region batches one after another on this thread
+const sequentialPool: RegionSolverPool = {
+  size: 4,
+  solve: (topology, { trains, options }) => Promise.resolve(solveSchedule(trains, topology, options)),
+};
+
+check('partitioned solver: merged schedule has no capacity, headway or exit violations', async () => {
+  for (const trainCount of [500, 3000]) {
+    const { topology, trains } = syntheticNetwork(trainCount, 5);
+    const schedule = await solvePartitioned(trains, topology, {
+      nowEpochS: 1758607200,
+      timeBudgetMs: 10000,
+      pool: sequentialPool,
+      minParallelTrains: 0,
+    });
+    assert.deepStrictEqual(scheduleViolations(trains, topology, schedule).slice(0, 5), [], `${trainCount} trains`);
+  }
+});
+
+const normalizeReroutes = (index: DisruptionIndex, sectionId: string) =>
+  index.rerouteOptions(sectionId, 1000)
+    .map(option => `${option.from_station}->${option.to_station}|${option.length_km}|${option.train_ids.slice().sort().join(',')}`)
+    .sort();
+
+check('disruption index: cached paths and incremental updates match a fresh index', () => {
+  const { topology, trains: initial } = syntheticNetwork(800, 9);
+  const random = createRandom(9);
+  const sectionIds = topology.sections.map(section => section.section_id);
+  const incremental = new DisruptionIndex(topology);
+  let trains = initial;
+  let disrupted: string[] = [];
+
+  for (let step = 0; step < 20; step++) {
+    trains = churn(trains, topology, random, step).trains;
+    // Add a couple of disruptions and clear one, so rows are both blocked and reopened
+    disrupted = disrupted.filter(() => random() > 0.3);
+    for (let i = 0; i < 2; i++) disrupted.push(sectionIds[Math.floor(random() * sectionIds.length)]);
+    const schedule = solveSchedule(trains, topology, { nowEpochS: 1758607200, timeBudgetMs: 10000 });
+
+    incremental.updateTrains(trains);
+    incremental.updateSchedule(schedule);
+    incremental.setDisrupted(disrupted);
+    const fresh = new DisruptionIndex(topology);
+    fresh.updateTrains(trains);
+    fresh.updateSchedule(schedule);
+    fresh.setDisrupted(disrupted);
+
+    const probes = disrupted.concat(sectionIds.filter(() => random() < 0.05));
+    probes.forEach(sectionId => {
+      assert.deepStrictEqual(incremental.affectedTrains(sectionId), fresh.affectedTrains(sectionId), `step ${step}, ${sectionId}`);
+      assert.deepStrictEqual(normalizeReroutes(incremental, sectionId), normalizeReroutes(fresh, sectionId), `step ${step}, ${sectionId}`);
+      incremental.rerouteOptions(sectionId, 1000).forEach(option => {
+        const blocked = option.sections.filter(section => disrupted.indexOf(section) !== -1);
+        assert.deepStrictEqual(blocked, [], `step ${step}: reroute around ${sectionId} uses disrupted sections`);
+      });
+    });
+  }
+});
+
+const main = async () => {
+  let failed = 0;
+  for (const { name, run } of checks) {
+    try {
+      await run();
+      console.log(`  ok    ${name}`);
+    } catch (error) {
+      failed++;
+      console.log(`  FAIL  ${name}`);
+      console.log(`        ${error instanceof Error ? error.message : error}`);
+    }
+  }
+  console.log(`${checks.length - failed}/${checks.length} checks passed`);
+  if (failed > 0) process.exit(1);
+};
+
+main().catch(error => {
+  console.error('Checks failed:', error);
+  process.exit(1);
+});
@@ -38,9 +38,33 @@
  * 4. Return the optimization schedule
  */
 
+/**
+ * POST /api/groq-optimization
+ *
+ * Request body:
+ * {
+ *   "prompt": "string - LLaMA optimization prompt",
+ *   "fingerprint": "string - hash of the optimization-relevant train state",
+ *   "model": "llama-3.3-70b-versatile",
+ *   "temperature": number,
+ *   "max_tokens": number,
+ *   "top_p": number
+ * }
+ *
+ * Response:
+ * {
+ *   "content": "string - raw LLM message content"
+ * }
+ *
+ * This endpoint should:
+ * 1. Return the cached content when the same fingerprint was answered recently
+ * 2. Share one in-flight Groq call between concurrent requests with the same fingerprint
+ * 3. Reuse a single pooled async Groq client with a bounded number of concurrent calls
+ */
+
 /**
  * POST /api/optimization/results
- * 
+ *
  * Request body: OptimizationSchedule object (same as above)
  * 
  * Response: Success/error status
@@ -51,6 +75,132 @@
  * 3. Return confirmation of storage
  */
 
+/**
+ * GET /api/optimization/results?from=&to=&train_id=
+ *
+ * Query parameters (all optional):
+ *   from     - epoch seconds, inclusive lower bound on now_epoch_s
+ *   to       - epoch seconds, inclusive upper bound on now_epoch_s
+ *   train_id - only return schedules (and schedule entries) for this train
+ *
+ * Response without parameters: { message, timestamp, data: OptimizationSchedule } (latest)
+ * Response with a range: application/x-ndjson, one OptimizationSchedule per line, oldest first
+ *
+ * Storage should be an append-only segment log instead of one
+ * train_schedule_<timestamp>.json per cycle:
+ * 1. Append compact (non pretty-printed) records to the active segment file
+ * 2. Keep a fixed-width (epoch_s, byte_offset) index per segment, memory-mapped,
+ *    so a range query is two binary searches and one sequential read
+ * 3. Rotate segments by size or hour; compact small sealed segments together
+ * 4. Apply retention by age and total size by deleting whole sealed segments
+ * 5. Stream matching records instead of loading every segment
+ */
+
+/**
+ * WS /ws/train-data
+ *
+ * Server -> client, once on connect and after every resync:
+ * {
+ *   "type": "snapshot",
+ *   "seq": number,
+ *   "payload": TrainBundle[]
+ * }
+ *
+ * Server -> client, whenever trains change:
+ * {
+ *   "type": "delta",
+ *   "seq": number,        - sequence number of this delta
+ *   "base_seq": number,   - seq of the state this delta applies on top of
+ *   "upserts": TrainBundle[],
+ *   "removed": ["TRAIN_ID"]
+ * }
+ *
+ * Client -> server when a delta's base_seq does not match its last seq:
+ * {
+ *   "type": "resync",
+ *   "last_seq": number
+ * }
+ *
+ * This endpoint should:
+ * 1. Send a full snapshot on connect and in reply to "resync"
+ * 2. Diff each train-data refresh per train_id and send only changed bundles
+ * 3. Coalesce for slow clients: while a client's send buffer is backed up, merge
+ *    pending deltas per train_id (latest bundle wins, removals override upserts),
+ *    keeping the first pending base_seq and the latest seq
+ * 4. Leave GET /api/train-data in place as the polling fallback
+ */
+
+/**
+ * GET /health
+ *
+ * Response (existing fields plus an optional "optimization" block):
+ * {
+ *   "status": "healthy",
+ *   ...
+ *   "optimization": {
+ *     "cycles_total": number,
+ *     "skipped_cycles_total": number,     - "too soon" and "already in progress" guards
+ *     "llm_fallbacks_total": number,
+ *     "llm_parse_failures_total": number,
+ *     "last_cycle_at": "ISO timestamp" | null,
+ *     "last_cycle_trains": number,
+ *     "stages": {
+ *       "fetch" | "conflict_analysis" | "prompt_build" | "llm_call" | "solver" | "fallback" | "save":
+ *         { "count": number, "p50_ms": number, "p99_ms": number }
+ *     }
+ *   }
+ * }
+ *
+ * GET /metrics (Prometheus text format, served by this app at app/metrics/route.ts;
+ * a backend running run_continuous_optimization should expose the same series):
+ *   optimization_stage_duration_seconds{stage}   histogram
+ *   optimization_cycle_duration_seconds          histogram
+ *   optimization_payload_bytes{payload}          histogram
+ *   optimization_cycles_total{outcome}           counter
+ *   optimization_skipped_cycles_total{reason}    counter
+ *   optimization_llm_fallbacks_total             counter
+ *   optimization_llm_parse_failures_total        counter
+ *   optimization_last_cycle_*                    gauges
+ *
+ * Slow cycles can be profiled with a sampling profiler started at the top of each
+ * cycle and kept only when the cycle exceeds a threshold (see setSlowCycleProfiler).
+ */
+
+/**
+ * GET /api/disruptions
+ *
+ * Response:
+ * {
+ *   "active_disruptions": {
+ *     "SEC_ID": {
+ *       "type": "string", "severity": "string", "start_time": "...", "end_time": "...",
+ *       "duration_minutes": number,
+ *       "affected_trains": ["TRAIN_ID"],
+ *       "reroute_options": [
+ *         {
+ *           "from_station": "STN_B",
+ *           "to_station": "STN_F",
+ *           "sections": ["SEC_6", "SEC_5"],
+ *           "length_km": number,
+ *           "train_ids": ["TRAIN_ID"]
+ *         }
+ *       ]
+ *     }
+ *   },
+ *   "affected_sections": number,
+ *   "timestamp": "string"
+ * }
+ *
+ * This endpoint should answer from indexes instead of rescanning every train:
+ * 1. Keep a reverse index section_id -> trains occupying it, heading through it or
+ *    scheduled into it, updated only for trains that changed
+ * 2. Cache shortest paths over the station graph per source station, with disrupted
+ *    sections removed
+ * 3. On a new disruption drop only cached rows whose shortest-path tree uses the
+ *    section; when one clears, drop only rows the reopened section would shorten
+ * (see src/lib/disruptionIndex.ts, which the client uses when these fields are absent)
+ */
+
 // Backend implementation example (Express.js):
 /*
 app.post('/api/optimization/generate', async (req, res) => {
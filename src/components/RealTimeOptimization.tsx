@@ -21,6 +21,7 @@ const RealTimeOptimization: React.FC<RealTimeOptimizationProps> = ({
   const {
     currentTrains,
     conflicts,
+    predictedConflicts,
     optimizationResults,
     isOptimizing,
     lastOptimized,
@@ -228,6 +229,45 @@ const RealTimeOptimization: React.FC<RealTimeOptimizationProps> = ({
                         {conflict.approaching && (
                           <span>Approaching: {conflict.approaching.join(', ')}</span>
                         )}
+                        {conflict.time_to_conflict_s !== undefined && (
+                          <span className="ml-2">In {Math.ceil(conflict.time_to_conflict_s / 60)} min</span>
+                        )}
+                      </div>
+                    </div>
+                    <span className={`px-2 py-1 rounded text-xs font-medium ${getConflictSeverityColor(conflict.severity)}`}>
+                      {conflict.severity.toUpperCase()}
+                    </span>
+                  </div>
+                </div>
+              ))}
+            </div>
+          </CardContent>
+        </Card>
+      )}
+
+      {/* Predicted Conflicts (soonest only) */}
+      {predictedConflicts.length > 0 && (
+        <Card>
+          <CardHeader>
+            <CardTitle className="text-lg flex items-center gap-2">
+              <Clock className="w-5 h-5 text-yellow-600" />
+              Predicted Conflicts ({predictedConflicts.length})
+            </CardTitle>
+          </CardHeader>
+          <CardContent>
+            <div className="space-y-3">
+              {predictedConflicts.map((conflict, index) => (
+                <div key={index} className={`p-3 rounded-lg border ${getConflictSeverityColor(conflict.severity)}`}>
+                  <div className="flex items-center justify-between">
+                    <div>
+                      <span className="font-medium">{conflict.section}</span>
+                      <div className="text-sm mt-1">
+                        {conflict.approaching && (
+                          <span>Approaching: {conflict.approaching.join(', ')}</span>
+                        )}
+                        {conflict.time_to_conflict_s !== undefined && (
+                          <span className="ml-2">In {Math.ceil(conflict.time_to_conflict_s / 60)} min</span>
+                        )}
                       </div>
                     </div>
                     <span className={`px-2 py-1 rounded text-xs font-medium ${getConflictSeverityColor(conflict.severity)}`}>
@@ -1,7 +1,12 @@
+import { useMemo } from 'react';
 import useSWR from 'swr';
 import { axiosInstance } from '@/lib/api';
-import { Disruption } from '@/types';
+import { Disruption, TrainBundle } from '@/types';
 import { mockDisruptions } from '@/lib/mockData';
+import { annotateDisruptions } from '@/lib/disruptionIndex';
+import { getScheduleStore } from '@/lib/scheduleStore';
+
+const NO_TRAINS: TrainBundle[] = [];
 
 const fetcher = async (url: string) => {
   try {
@@ -21,7 +26,9 @@ const fetcher = async (url: string) => {
           start_time: disruptionData.start_time,
           estimated_end_time: disruptionData.end_time,
           description: `${disruptionData.type?.replace('_', ' ').toUpperCase() || 'Maintenance'} in section ${sectionId} - Duration: ${disruptionData.duration_minutes || 'Unknown'} minutes`,
-          affected_trains: [] // Backend doesn't provide this directly, would need to calculate
+          // Filled in from the disruption index when the backend leaves these out
+          affected_trains: disruptionData.affected_trains || [],
+          reroute_options: disruptionData.reroute_options,
         });
       });
     }
@@ -33,7 +40,9 @@ const fetcher = async (url: string) => {
   }
 };
 
-export const useDisruptions = (refreshInterval = 60000) => { // Changed default to 60 seconds to avoid conflicts
+// `trains` comes from the caller's own useTrainData so this hook adds no train
+// polling of its own and follows the caller's refresh settings
+export const useDisruptions = (refreshInterval = 60000, trains: TrainBundle[] = NO_TRAINS) => { // Changed default to 60 seconds to avoid conflicts
   const { data, error, mutate, isLoading } = useSWR<Disruption[]>(
     '/api/disruptions',
     fetcher,
@@ -48,8 +57,15 @@ export const useDisruptions = (refreshInterval = 60000) => { // Changed default
     }
   );
 
+  // Affected trains and reroutes from the section -> trains index, re-evaluated
+  // whenever the disruptions or the caller's train data change
+  const disruptions = useMemo(
+    () => annotateDisruptions(data || mockDisruptions, trains, getScheduleStore()?.latest() ?? null),
+    [data, trains]
+  );
+
   return {
-    disruptions: data || mockDisruptions,
+    disruptions,
     isLoading,
     isError: error,
     mutate,
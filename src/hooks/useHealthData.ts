@@ -2,6 +2,7 @@ import useSWR from 'swr';
 import { axiosInstance } from '@/lib/api';
 import { HealthResponse } from '@/types';
 import { mockHealthData } from '@/lib/mockData';
+import { optimizationMetrics } from '@/lib/metrics';
 
 const fetcher = async (url: string) => {
   try {
@@ -28,8 +29,11 @@ export const useHealthData = (refreshInterval = 60000) => { // Changed to 60 sec
     }
   );
 
+  // Backends that predate the optimization block fall back to this session's own metrics
+  const healthData = data || mockHealthData;
+
   return {
-    healthData: data || mockHealthData,
+    healthData: healthData.optimization ? healthData : { ...healthData, optimization: optimizationMetrics.health() },
     isLoading,
     isError: error,
     mutate,
@@ -2,62 +2,44 @@
 
 import { useState, useEffect, useCallback, useRef } from 'react';
 import axios from 'axios';
+import { TrainBundle, Conflict, OptimizationSchedule } from '@/types';
+import { solvePartitioned } from '@/lib/networkPartition';
+import { getRegionWorkerPool } from '@/lib/regionWorkerPool';
+import { defaultTopology } from '@/lib/topology';
+import { createOptimizationPrompt } from '@/lib/optimizationPrompt';
+import { generateFallbackSchedule, generateIntelligentFallbackSchedule } from '@/lib/fallbackSchedules';
+import { ConflictAnalyzer } from '@/lib/conflictAnalyzer';
+import { projectConflicts } from '@/lib/conflictProjection';
+import { getTrainStream } from '@/lib/trainStream';
+import { fingerprintState, scheduleCache, singleFlight } from '@/lib/scheduleCache';
+import { requestGroqOptimization } from '@/lib/groqClient';
+import { getScheduleStore, ScheduleQuery } from '@/lib/scheduleStore';
+import { optimizationMetrics, createSelfProfilerStart } from '@/lib/metrics';
 
 // Global flag to prevent multiple optimization engine instances
 let globalOptimizationEngineActive = false;
 
-interface TrainData {
-  train: {
-    train_id: string;
-    type: string;
-    priority: number;
-    status: string;
-    max_speed_kmh: number;
-    destination_station: string;
-    current_location: {
-      section_id: string;
-      position_m: number;
-    };
-    direction: string;
-    restricted_speed?: boolean;
-    breakdown_until?: string;
-  };
-  event: {
-    delay_duration_min?: number;
-  };
-  section: {
-    section_id: string;
-    is_disrupted: boolean;
-  };
-}
+// Predicted conflicts passed on to the prompt and the UI, soonest first; the full
+// projection can hold thousands on large networks
+const MAX_PREDICTED_CONFLICTS = 20;
 
-interface Conflict {
-  type: string;
-  section: string;
-  capacity?: number;
-  current_trains?: string[];
-  occupied_by?: string[];
-  approaching?: string[];
-  severity: string;
-}
+// Identifies this browser session's series on the Next.js /metrics endpoint
+const metricsInstance = Math.random().toString(36).slice(2, 10);
 
-interface OptimizationSchedule {
-  now_epoch_s: number;
-  horizon_s: number;
-  snapshot_trains_considered: number;
-  schedule: Record<string, {
-    target_section: string;
-    entry_offset_s: number;
-    entry_epoch_s: number;
-    action: string;
-    priority: number;
-    status: string;
-  }>;
-}
+// Push the cycle metrics to /metrics so Prometheus can scrape them
+const publishMetrics = () => {
+  if (typeof window === 'undefined') return;
+  axios.post('/metrics', { instance: metricsInstance, snapshot: optimizationMetrics.snapshot() }, {
+    timeout: 5000,
+  }).catch(error => {
+    console.warn('Failed to publish optimization metrics:', error.message);
+  });
+};
 
 interface OptimizationEngineState {
-  currentTrains: TrainData[];
+  currentTrains: TrainBundle[];
   conflicts: Conflict[];
+  predictedConflicts: Conflict[];
   optimizationResults: OptimizationSchedule | null;
   isOptimizing: boolean;
   lastOptimized: Date | null;
@@ -76,6 +58,7 @@ const useOptimizationEngine = (
   const [state, setState] = useState<OptimizationEngineState>({
     currentTrains: [],
     conflicts: [],
+    predictedConflicts: [],
     optimizationResults: null,
     isOptimizing: false,
     lastOptimized: null,
@@ -90,6 +73,7 @@ const useOptimizationEngine = (
   const isPollingRef = useRef(false);
   const lastOptimizationTime = useRef(0); // Track last optimization time
   const hasAutoStartedRef = useRef(false); // Track if auto-start has already been attempted
+  const lastScheduleRef = useRef<OptimizationSchedule | null>(null); // Warm start for the schedule solver
 
   // Cleanup effect to prevent memory leaks
   useEffect(() => {
@@ -114,29 +98,69 @@ const useOptimizationEngine = (
     }
   }, []); // Empty dependency array - only run once on mount
 
-  // Section capacity mapping (same as Python decision_taker.py)
-  const sectionCapacity: Record<string, number> = {
-    "SEC_1": 2, "SEC_2": 1, "SEC_3": 2,
-    "SEC_4": 1, "SEC_5": 3, "SEC_6": 1
-  };
+  // Network topology (same as Python decision_taker.py sectionCapacity/sectionGraph),
+  // loaded from src/lib/topology.json
+  const topology = defaultTopology;
 
-  // Section graph (same as Python decision_taker.py)
-  const sectionGraph: Record<string, { next: string[]; stations: string[]; length_km: number }> = {
-    "SEC_1": { next: ["SEC_2"], stations: ["STN_A", "STN_B"], length_km: 8.5 },
-    "SEC_2": { next: ["SEC_3"], stations: ["STN_B", "STN_C"], length_km: 6.2 },
-    "SEC_3": { next: ["SEC_4"], stations: ["STN_C", "STN_D"], length_km: 7.8 },
-    "SEC_4": { next: ["SEC_5"], stations: ["STN_D", "STN_E"], length_km: 5.3 },
-    "SEC_5": { next: ["SEC_6"], stations: ["STN_E", "STN_F"], length_km: 9.1 },
-    "SEC_6": { next: [], stations: ["STN_B", "STN_E"], length_km: 12.0 }
-  };
+  // Incremental conflict analyzer kept across cycles so only changed trains are reapplied
+  const conflictAnalyzerRef = useRef<ConflictAnalyzer | null>(null);
+  if (!conflictAnalyzerRef.current) {
+    conflictAnalyzerRef.current = new ConflictAnalyzer(topology);
+  }
+
+  // Stream deltas received since the conflict analyzer was last brought up to date;
+  // null after a snapshot or resync, or when the analyzer was last fed polled data,
+  // in which case the next cycle applies the full train list
+  const streamChangesRef = useRef<{ upserts: Map<string, TrainBundle>; removed: Set<string> } | null>(null);
+
+  // Keep the shared /ws/train-data stream open while the engine is mounted
+  useEffect(() => {
+    return getTrainStream(apiBaseUrl).subscribe(update => {
+      const changes = streamChangesRef.current;
+      if (update.snapshot || !changes) {
+        streamChangesRef.current = null;
+        return;
+      }
+      update.upserts.forEach(bundle => {
+        changes.upserts.set(bundle.train.train_id, bundle);
+        changes.removed.delete(bundle.train.train_id);
+      });
+      update.removed.forEach(trainId => {
+        changes.upserts.delete(trainId);
+        changes.removed.add(trainId);
+      });
+    });
+  }, [apiBaseUrl]);
+
+  // Profile cycles with the JS Self-Profiling API (where the browser allows it) and
+  // report the ones that take more than half the polling interval
+  useEffect(() => {
+    optimizationMetrics.setSlowCycleProfiler({
+      thresholdMs: pollingInterval / 2,
+      start: createSelfProfilerStart(),
+      onSlowCycle: report => {
+        console.warn(`Slow optimization cycle (${report.duration_ms}ms):`, report.stages_ms, report.trace);
+      },
+    });
+    return () => optimizationMetrics.setSlowCycleProfiler(null);
+  }, [pollingInterval]);
 
   // Fetch train data from API (same as Python decision_taker.py fetchTrainData)
-  const fetchTrainData = useCallback(async (): Promise<TrainData[] | null> => {
+  const fetchTrainData = useCallback(async (): Promise<TrainBundle[] | null> => {
+    // The delta stream already holds the current state; only poll when it is down
+    const stream = getTrainStream(apiBaseUrl);
+    if (stream.isLive) {
+      return stream.getSnapshot();
+    }
+
     try {
       const response = await axios.get(`${apiBaseUrl}/api/train-data`, {
         timeout: 30000,
+        responseType: 'text',
       });
-      return response.data?.payload || [];
+      const body: string = typeof response.data === 'string' ? response.data : JSON.stringify(response.data);
+      optimizationMetrics.observePayload('train_data', body.length);
+      return JSON.parse(body)?.payload || [];
     } catch (error) {
       console.error('Failed to fetch train data:', error);
       setState(prev => ({ ...prev, error: 'Failed to fetch train data' }));
@@ -144,372 +168,151 @@ const useOptimizationEngine = (
     }
   }, [apiBaseUrl]);
 
-  // Analyze conflicts (same logic as Python decision_taker.py analyzeConflicts)
-  const analyzeConflicts = useCallback((trains: TrainData[]): Conflict[] => {
-    const conflicts: Conflict[] = [];
-    const sectionOccupancy: Record<string, string[]> = {};
-
-    // Track current occupancy
-    trains.forEach(train => {
-      const trainData = train.train;
-      if (!['Arrived', 'Cancelled'].includes(trainData.status)) {
-        const sectionId = trainData.current_location?.section_id;
-        if (sectionId) {
-          if (!sectionOccupancy[sectionId]) {
-            sectionOccupancy[sectionId] = [];
-          }
-          sectionOccupancy[sectionId].push(trainData.train_id);
-        }
-      }
-    });
-
-    // Check for capacity violations
-    Object.entries(sectionOccupancy).forEach(([sectionId, occupiedTrains]) => {
-      const capacity = sectionCapacity[sectionId] || 1;
-      if (occupiedTrains.length > capacity) {
-        conflicts.push({
-          type: 'capacity_exceeded',
-          section: sectionId,
-          capacity,
-          current_trains: occupiedTrains,
-          severity: 'high'
-        });
-      }
-    });
-
-    // Check for potential collisions in single-track sections
-    Object.entries(sectionOccupancy).forEach(([sectionId, occupiedTrains]) => {
-      if ((sectionCapacity[sectionId] || 1) === 1 && occupiedTrains.length > 0) {
-        const approaching: string[] = [];
-        
-        trains.forEach(train => {
-          const trainData = train.train;
-          const trainId = trainData.train_id;
-          
-          if (!occupiedTrains.includes(trainId)) {
-            const currentSection = trainData.current_location?.section_id;
-            if (currentSection && sectionGraph[currentSection]?.next) {
-              if (sectionGraph[currentSection].next.includes(sectionId)) {
-                approaching.push(trainId);
-              }
-            }
-          }
-        });
-
-        if (approaching.length > 0) {
-          conflicts.push({
-            type: 'single_track_conflict',
-            section: sectionId,
-            occupied_by: occupiedTrains,
-            approaching,
-            severity: 'medium'
-          });
-        }
-      }
-    });
-
-    return conflicts;
-  }, [sectionCapacity, sectionGraph]);
-
-  // Create optimization prompt (exact same as Python decision_taker.py)
-  const createOptimizationPrompt = useCallback((trains: TrainData[], conflicts: Conflict[]): string => {
-    const currentTime = new Date();
-    const currentEpoch = Math.floor(currentTime.getTime() / 1000);
-
-    const activeTrains = trains.filter(train => 
-      !['Arrived', 'Cancelled'].includes(train.train.status)
-    );
-
-    let prompt = `You are an expert railway traffic controller. Your task is to optimize train scheduling to minimize delays and conflicts.
-
-CURRENT SITUATION:
-- Current time: ${currentTime.toISOString()}
-- Current epoch: ${currentEpoch}
-- Total active trains: ${activeTrains.length}
-
-RAILWAY NETWORK:
-- SEC_1: STN_A→STN_B (8.5km, capacity: 2, double track)
-- SEC_2: STN_B→STN_C (6.2km, capacity: 1, single track)
-- SEC_3: STN_C→STN_D (7.8km, capacity: 2, double track)
-- SEC_4: STN_D→STN_E (5.3km, capacity: 1, single track)
-- SEC_5: STN_E→STN_F (9.1km, capacity: 3, double track)
-- SEC_6: STN_B→STN_E (12.0km, capacity: 1, single track, bypass route)
-
-CURRENT TRAINS:
-`;
-
-    activeTrains.forEach(train => {
-      const trainData = train.train;
-      const location = trainData.current_location || {};
-      prompt += `- ${trainData.train_id}: ${trainData.type || 'Unknown'} (Priority: ${trainData.priority || 1}) `;
-      prompt += `at ${location.section_id || 'Unknown'} position ${location.position_m || 0}m, `;
-      prompt += `Status: ${trainData.status || 'Unknown'}, `;
-      prompt += `Destination: ${trainData.destination_station || 'Unknown'}, `;
-      prompt += `Max Speed: ${trainData.max_speed_kmh || 100}km/h\n`;
-    });
-
-    if (conflicts.length > 0) {
-      prompt += '\nIDENTIFIED CONFLICTS:\n';
-      conflicts.forEach(conflict => {
-        prompt += `- ${conflict.type} at ${conflict.section}: ${JSON.stringify(conflict)}\n`;
-      });
-    }
-
-    prompt += `
-OPTIMIZATION OBJECTIVES:
-1. Prioritize high-priority trains (Express=5, Local=3, Freight=2)
-2. Minimize total delay time
-3. Avoid conflicts in single-track sections (SEC_2, SEC_4, SEC_6)
-4. Optimize capacity utilization
-5. Consider train speeds and journey times
-
-CONSTRAINTS:
-- Single-track sections can only handle one train at a time
-- Trains cannot reverse direction
-- Higher priority trains should be scheduled first
-- Safety margins must be maintained
-
-Please generate an optimized schedule in the following JSON format:
-{
-  "now_epoch_s": ${currentEpoch},
-  "horizon_s": 3600,
-  "snapshot_trains_considered": ${activeTrains.length},
-  "schedule": {
-    "TRAIN_ID": {
-      "target_section": "SEC_X",
-      "entry_offset_s": 0,
-      "entry_epoch_s": ${currentEpoch},
-      "action": "proceed|hold_until_YYYY-MM-DDTHH:MM:SS|reroute",
-      "priority": 1-5,
-      "status": "On time|Delayed|Waiting"
+  // Analyze conflicts (same logic as Python decision_taker.py analyzeConflicts).
+  // When `trains` is the live stream state and the analyzer already matched the
+  // stream at its last update, only the accumulated deltas are applied.
+  const analyzeConflicts = useCallback((trains: TrainBundle[]): Conflict[] => {
+    const analyzer = conflictAnalyzerRef.current!;
+    const stream = getTrainStream(apiBaseUrl);
+    const fromStream = stream.isLive && trains === stream.getSnapshot();
+    const changes = streamChangesRef.current;
+    if (fromStream && changes) {
+      analyzer.applyChanges(Array.from(changes.upserts.values()), Array.from(changes.removed));
+    } else {
+      analyzer.update(trains);
     }
-  }
-}
+    // Only a stream snapshot is a base that later deltas apply to
+    streamChangesRef.current = fromStream ? { upserts: new Map(), removed: new Set() } : null;
+    return analyzer.conflicts();
+  }, [apiBaseUrl]);
 
-Consider these actions:
-- "proceed": Allow immediate movement
-- "hold_until_TIMESTAMP": Hold train until specified time
-- "reroute": Use alternative path (SEC_6 as bypass)
+  // Soonest conflicts predicted by projecting every train forward over the horizon,
+  // kept apart from the current conflicts
+  const predictConflicts = useCallback((trains: TrainBundle[]): Conflict[] => {
+    return projectConflicts(trains, topology, { horizonS: 3600 }).slice(0, MAX_PREDICTED_CONFLICTS);
+  }, [topology]);
 
-Focus on the most critical trains first. Provide only the JSON response without additional explanation.
-`;
 
-    return prompt;
-  }, []);
+  // Solve schedule with section capacity, single-track and headway constraints,
+  // warm-started from the previous cycle so decisions stay stable between polls.
+  // Large networks are split into regions and solved in the worker pool.
+  const getSolverSchedule = useCallback(async (trains: TrainBundle[], conflicts: Conflict[]): Promise<OptimizationSchedule> => {
+    try {
+      const schedule = await optimizationMetrics.timeStageAsync('solver', () =>
+        solvePartitioned(trains, topology, {
+          horizonS: 3600,
+          timeBudgetMs: 250,
+          previousSchedule: lastScheduleRef.current,
+          pool: getRegionWorkerPool(),
+        })
+      );
+      console.log(`Generated solver schedule for ${Object.keys(schedule.schedule).length} trains`);
+      return schedule;
+    } catch (error) {
+      console.error('Schedule solver failed:', error);
+      if (conflicts.length > 0 || trains.length > 3) {
+        console.log('Using intelligent conflict resolution optimization');
+        return optimizationMetrics.timeStage('fallback', () =>
+          generateIntelligentFallbackSchedule(trains, conflicts, topology.sectionCapacity)
+        );
+      }
+      console.log('Using simple fallback optimization');
+      return optimizationMetrics.timeStage('fallback', () => generateFallbackSchedule(trains));
+    }
+  }, [topology]);
 
   // Get optimized schedule using Groq LLaMA 3.3 (same as Python decision_taker.py)
-  const getOptimizedScheduleWithGroq = useCallback(async (trains: TrainData[], conflicts: Conflict[]): Promise<OptimizationSchedule> => {
+  const getOptimizedScheduleWithGroq = useCallback(async (
+    trains: TrainBundle[],
+    conflicts: Conflict[],
+    predictedConflicts: Conflict[] = []
+  ): Promise<OptimizationSchedule> => {
     if (!groqApiKey) {
-      console.warn('No Groq API key provided, using fallback optimization');
-      return generateFallbackSchedule(trains);
+      console.warn('No Groq API key provided, using schedule solver');
+      return getSolverSchedule(trains, conflicts);
     }
 
     try {
-      const prompt = createOptimizationPrompt(trains, conflicts);
-      
-      // Call Groq API (you'll need to implement this as a backend endpoint since Groq requires server-side calls)
-      const response = await axios.post(`${apiBaseUrl}/api/groq-optimization`, {
-        prompt,
-        model: "llama-3.3-70b-versatile",
-        temperature: 0.1,
-        max_tokens: 2048,
-        top_p: 0.9
-      }, {
-        timeout: 30000,
-        headers: { 'Content-Type': 'application/json' }
-      });
+      // Identical network states reuse the cached schedule, re-based to now
+      const fingerprint = fingerprintState(trains, conflicts.concat(predictedConflicts));
+      const cached = scheduleCache.get(fingerprint);
+      if (cached) {
+        console.log(`Reusing cached Groq schedule for state ${fingerprint}`);
+        return cached;
+      }
+
+      // Concurrent requesters for the same state share one LLM call
+      const schedule = await singleFlight(fingerprint, async (): Promise<OptimizationSchedule> => {
+        const prompt = optimizationMetrics.timeStage('prompt_build', () =>
+          createOptimizationPrompt(trains, conflicts, topology, predictedConflicts)
+        );
+        optimizationMetrics.observePayload('prompt', prompt.length);
+        
+        // Call Groq API (you'll need to implement this as a backend endpoint since Groq requires server-side calls)
+        const content = await optimizationMetrics.timeStageAsync('llm_call', () =>
+          requestGroqOptimization(apiBaseUrl, { prompt, fingerprint })
+        );
+        console.log(`LLaMA response length: ${content.length} characters`);
+        optimizationMetrics.observePayload('llm_response', content.length);
 
-      const content = response.data.content?.trim();
-      console.log(`LLaMA response length: ${content?.length || 0} characters`);
+        let parsed: OptimizationSchedule;
+        try {
+          // Extract JSON from response
+          const jsonStart = content.indexOf('{');
+          const jsonEnd = content.lastIndexOf('}') + 1;
 
-      // Extract JSON from response
-      const jsonStart = content.indexOf('{');
-      const jsonEnd = content.lastIndexOf('}') + 1;
+          if (jsonStart === -1 || jsonEnd <= jsonStart) {
+            throw new Error('No valid JSON found in response');
+          }
 
-      if (jsonStart === -1 || jsonEnd <= jsonStart) {
-        throw new Error('No valid JSON found in response');
-      }
+          const jsonStr = content.substring(jsonStart, jsonEnd);
+          parsed = JSON.parse(jsonStr);
 
-      const jsonStr = content.substring(jsonStart, jsonEnd);
-      const schedule = JSON.parse(jsonStr);
+          // Validate schedule structure
+          if (!parsed || typeof parsed !== 'object' || !parsed.schedule) {
+            throw new Error('Invalid schedule structure');
+          }
+        } catch (parseError) {
+          optimizationMetrics.increment('optimization_llm_parse_failures_total');
+          throw parseError;
+        }
 
-      // Validate schedule structure
-      if (!schedule || typeof schedule !== 'object' || !schedule.schedule) {
-        throw new Error('Invalid schedule structure');
-      }
+        scheduleCache.set(fingerprint, parsed);
+        return parsed;
+      });
 
       console.log(`Generated Groq schedule for ${Object.keys(schedule.schedule || {}).length} trains`);
       return schedule;
 
     } catch (error) {
       console.error('Error generating Groq optimized schedule:', error);
-      console.log('Falling back to intelligent optimization');
-      return generateIntelligentFallbackSchedule(trains, conflicts);
+      console.log('Falling back to schedule solver');
+      optimizationMetrics.increment('optimization_llm_fallbacks_total');
+      return getSolverSchedule(trains, conflicts);
     }
-  }, [apiBaseUrl, groqApiKey, createOptimizationPrompt]);
-
-  // Generate intelligent fallback schedule (enhanced version of Python _generateFallbackSchedule)
-  const generateIntelligentFallbackSchedule = useCallback((trains: TrainData[], conflicts: Conflict[]): OptimizationSchedule => {
-    const currentTime = new Date();
-    const currentEpoch = Math.floor(currentTime.getTime() / 1000);
-
-    const activeTrains = trains.filter(train => 
-      !['Arrived', 'Cancelled'].includes(train.train.status)
-    );
-
-    const schedule: Record<string, any> = {};
-    
-    // Sort by priority and analyze conflicts (more intelligent than simple fallback)
-    const sortedTrains = [...activeTrains].sort((a, b) => {
-      // First by priority (higher first)
-      const priorityDiff = (b.train.priority || 1) - (a.train.priority || 1);
-      if (priorityDiff !== 0) return priorityDiff;
-      
-      // Then by status (running trains first)
-      const statusOrder = { 'Running': 0, 'Delayed': 1, 'Stopped': 2, 'Boarding': 3 };
-      return (statusOrder[a.train.status as keyof typeof statusOrder] || 4) - 
-             (statusOrder[b.train.status as keyof typeof statusOrder] || 4);
-    });
-
-    // Track section occupancy for conflict resolution
-    const sectionOccupancy: Record<string, string[]> = {};
-    const sectionSchedule: Record<string, number> = {}; // Next available time for each section
-
-    sortedTrains.forEach((train, index) => {
-      const trainData = train.train;
-      const currentSection = trainData.current_location?.section_id || 'SEC_1';
-      
-      // Check for conflicts in current or target sections
-      const isInConflict = conflicts.some(conflict => 
-        conflict.current_trains?.includes(trainData.train_id) ||
-        conflict.approaching?.includes(trainData.train_id)
-      );
-
-      let action = 'proceed';
-      let entryTime = currentEpoch;
-      let targetSection = currentSection;
-
-      if (isInConflict) {
-        // Handle conflict resolution
-        const conflictingSection = conflicts.find(c => 
-          c.current_trains?.includes(trainData.train_id) || 
-          c.approaching?.includes(trainData.train_id)
-        );
-
-        if (conflictingSection) {
-          const sectionId = conflictingSection.section;
-          const capacity = sectionCapacity[sectionId] || 1;
-          const currentOccupancy = sectionOccupancy[sectionId]?.length || 0;
-
-          if (currentOccupancy >= capacity) {
-            // Hold train until section is available
-            const baseDelay = 60; // 1 minute base delay
-            const priorityDelay = Math.max(0, 5 - (trainData.priority || 1)) * 30; // Lower priority = more delay
-            const positionDelay = index * 15; // Sequential delay based on processing order
-            
-            const totalDelay = baseDelay + priorityDelay + positionDelay;
-            entryTime = currentEpoch + totalDelay;
-            action = `hold_until_${new Date((currentEpoch + totalDelay) * 1000).toISOString()}`;
-            
-            console.log(`Train ${trainData.train_id} delayed by ${totalDelay}s due to ${conflictingSection.type}`);
-          }
-        }
-      }
-
-      // Track section usage
-      if (!sectionOccupancy[targetSection]) {
-        sectionOccupancy[targetSection] = [];
-      }
-      sectionOccupancy[targetSection].push(trainData.train_id);
-      sectionSchedule[targetSection] = Math.max(sectionSchedule[targetSection] || currentEpoch, entryTime + 30);
-
-      schedule[trainData.train_id] = {
-        target_section: targetSection,
-        entry_offset_s: entryTime - currentEpoch,
-        entry_epoch_s: entryTime,
-        action: action,
-        priority: trainData.priority || 1,
-        status: isInConflict ? 'Conflict resolved' : 'Optimized'
-      };
-    });
-
-    return {
-      now_epoch_s: currentEpoch,
-      horizon_s: 3600,
-      snapshot_trains_considered: activeTrains.length,
-      schedule
-    };
-  }, [sectionCapacity]);
-
-  // Generate simple fallback schedule (same as Python _generateFallbackSchedule)
-  const generateFallbackSchedule = useCallback((trains: TrainData[]): OptimizationSchedule => {
-    const currentTime = new Date();
-    const currentEpoch = Math.floor(currentTime.getTime() / 1000);
-
-    const activeTrains = trains.filter(train => 
-      !['Arrived', 'Cancelled'].includes(train.train.status)
-    );
-
-    const schedule: Record<string, any> = {};
-    let offset = 0;
-
-    // Sort by priority (higher first)
-    const sortedTrains = [...activeTrains].sort((a, b) => 
-      (b.train.priority || 1) - (a.train.priority || 1)
-    );
-
-    sortedTrains.forEach(train => {
-      const trainData = train.train;
-      const currentSection = trainData.current_location?.section_id || 'SEC_1';
-
-      schedule[trainData.train_id] = {
-        target_section: currentSection,
-        entry_offset_s: offset,
-        entry_epoch_s: currentEpoch + offset,
-        action: 'proceed',
-        priority: trainData.priority || 1,
-        status: trainData.status || 'On time'
-      };
-
-      offset += 30; // 30-second intervals
-    });
+  }, [apiBaseUrl, groqApiKey, topology, getSolverSchedule]);
 
-    return {
-      now_epoch_s: currentEpoch,
-      horizon_s: 3600,
-      snapshot_trains_considered: activeTrains.length,
-      schedule
-    };
-  }, []);
 
   // Save schedule to backend (same as Python decision_taker.py save_schedule)
   const saveSchedule = useCallback(async (schedule: OptimizationSchedule): Promise<void> => {
     try {
       // Save to backend API (same as Python decision_taker.py)
-      await axios.post(`${apiBaseUrl}/api/optimization/results`, schedule, {
+      const body = JSON.stringify(schedule);
+      optimizationMetrics.observePayload('schedule', body.length);
+      await axios.post(`${apiBaseUrl}/api/optimization/results`, body, {
         timeout: 10000,
         headers: { 'Content-Type': 'application/json' }
       });
       console.log('Optimization results sent to API server');
-      
-      // Also save to local storage as backup
-      const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
-      const filename = `train_schedule_${timestamp}`;
-      localStorage.setItem(filename, JSON.stringify(schedule));
-      console.log(`Schedule saved locally as ${filename}`);
-      
     } catch (error) {
       console.error('Failed to send results to API:', error);
-      
-      // Save locally even if API fails
-      try {
-        const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
-        const filename = `train_schedule_${timestamp}_offline`;
-        localStorage.setItem(filename, JSON.stringify(schedule));
-        console.log(`Schedule saved locally (offline) as ${filename}`);
-      } catch (localError) {
-        console.error('Failed to save locally:', localError);
-      }
+    }
+
+    // Also append to the local segmented schedule log as backup, even if the API fails
+    try {
+      getScheduleStore()?.append(schedule);
+    } catch (localError) {
+      console.error('Failed to save locally:', localError);
     }
   }, [apiBaseUrl]);
 
@@ -533,30 +336,51 @@ Focus on the most critical trains first. Provide only the JSON response without
     }
   }, [apiBaseUrl]);
 
+  // Fetch schedule history for a time range, optionally for one train.
+  // The backend streams one OptimizationSchedule per line (NDJSON).
+  const fetchOptimizationHistory = useCallback(async (
+    query: ScheduleQuery = {}
+  ): Promise<OptimizationSchedule[]> => {
+    try {
+      const response = await axios.get(`${apiBaseUrl}/api/optimization/results`, {
+        timeout: 30000,
+        params: query,
+        responseType: 'text',
+        headers: { Accept: 'application/x-ndjson' }
+      });
+
+      const body: string = typeof response.data === 'string' ? response.data : '';
+      return body
+        .split('\n')
+        .filter(line => line.trim().length > 0)
+        .map(line => JSON.parse(line) as OptimizationSchedule);
+    } catch (error) {
+      console.error('Failed to fetch optimization history:', error);
+      return [];
+    }
+  }, [apiBaseUrl]);
+
   // Get optimized schedule (main optimization logic from Python decision_taker.py)
-  const getOptimizedSchedule = useCallback(async (trains: TrainData[]): Promise<OptimizationSchedule> => {
-    const conflicts = analyzeConflicts(trains);
+  const getOptimizedSchedule = useCallback(async (
+    trains: TrainBundle[],
+    conflicts: Conflict[] = analyzeConflicts(trains),
+    predictedConflicts: Conflict[] = []
+  ): Promise<OptimizationSchedule> => {
 
-    // If Groq API key is available, try AI optimization
+    // LLM optimization is opt-in; the solver handles every other cycle
     if (state.useGroqAI && groqApiKey) {
       try {
         console.log('Attempting Groq AI optimization...');
-        return await getOptimizedScheduleWithGroq(trains, conflicts);
+        return await getOptimizedScheduleWithGroq(trains, conflicts, predictedConflicts);
       } catch (error) {
         console.error('Groq AI optimization failed:', error);
-        console.log('Falling back to intelligent optimization');
+        console.log('Falling back to schedule solver');
+        optimizationMetrics.increment('optimization_llm_fallbacks_total');
       }
     }
 
-    // Use intelligent fallback optimization
-    if (conflicts.length > 0 || trains.length > 3) {
-      console.log('Using intelligent conflict resolution optimization');
-      return generateIntelligentFallbackSchedule(trains, conflicts);
-    } else {
-      console.log('Using simple fallback optimization');
-      return generateFallbackSchedule(trains);
-    }
-  }, [state.useGroqAI, groqApiKey, analyzeConflicts, getOptimizedScheduleWithGroq, generateIntelligentFallbackSchedule, generateFallbackSchedule]);
+    return getSolverSchedule(trains, conflicts);
+  }, [state.useGroqAI, groqApiKey, analyzeConflicts, getOptimizedScheduleWithGroq, getSolverSchedule]);
 
   // Single optimization cycle (same as Python decision_taker.py optimizeTraffic)
   const optimizeTraffic = useCallback(async (): Promise<OptimizationSchedule | null> => {
@@ -565,29 +389,36 @@ Focus on the most critical trains first. Provide only the JSON response without
     // Prevent calls that are too frequent (minimum 15 seconds between optimizations)
     if (now - lastOptimizationTime.current < 15000) {
       console.log('Skipping optimization - too soon since last run');
+      optimizationMetrics.skipCycle('too_soon');
       return null;
     }
     
     // Check if optimization engine is still active
     if (!globalOptimizationEngineActive) {
       console.log('Optimization engine not active, skipping');
+      optimizationMetrics.skipCycle('inactive');
       return null;
     }
     
     if (optimizingRef.current) {
       console.log('Optimization already in progress, skipping...');
+      optimizationMetrics.skipCycle('in_progress');
       return null;
     }
 
     optimizingRef.current = true;
     lastOptimizationTime.current = now;
     setState(prev => ({ ...prev, isOptimizing: true, error: null }));
+    optimizationMetrics.beginCycle();
+    let outcome: 'success' | 'error' = 'error';
+    let trainCount = 0;
+    let conflictCount = 0;
 
     try {
       console.log('Starting traffic optimization cycle');
 
       // Fetch current train data
-      const trains = await fetchTrainData();
+      const trains = await optimizationMetrics.timeStageAsync('fetch', fetchTrainData);
       if (!trains) {
         setState(prev => ({ ...prev, error: 'Failed to fetch train data' }));
         return null;
@@ -596,20 +427,29 @@ Focus on the most critical trains first. Provide only the JSON response without
       console.log(`Processing ${trains.length} trains`);
 
       // Analyze conflicts
-      const conflicts = analyzeConflicts(trains);
-      console.log(`Found ${conflicts.length} conflicts`);
+      const { conflicts, predictedConflicts } = optimizationMetrics.timeStage('conflict_analysis', () => ({
+        conflicts: analyzeConflicts(trains),
+        predictedConflicts: predictConflicts(trains),
+      }));
+      console.log(`Found ${conflicts.length} conflicts, ${predictedConflicts.length} predicted`);
 
       // Generate optimized schedule
-      const schedule = await getOptimizedSchedule(trains);
+      const schedule = await getOptimizedSchedule(trains, conflicts, predictedConflicts);
+
+      lastScheduleRef.current = schedule;
 
       // Save schedule
-      await saveSchedule(schedule);
+      await optimizationMetrics.timeStageAsync('save', () => saveSchedule(schedule));
+      outcome = 'success';
+      trainCount = trains.length;
+      conflictCount = conflicts.length;
 
       // Update state
       setState(prev => ({
         ...prev,
         currentTrains: trains,
         conflicts,
+        predictedConflicts,
         optimizationResults: schedule,
         lastOptimized: new Date(),
         error: null,
@@ -635,8 +475,10 @@ Focus on the most critical trains first. Provide only the JSON response without
     } finally {
       optimizingRef.current = false;
       setState(prev => ({ ...prev, isOptimizing: false }));
+      optimizationMetrics.endCycle(outcome, trainCount, conflictCount);
+      publishMetrics();
     }
-  }, [fetchTrainData, analyzeConflicts, getOptimizedSchedule, saveSchedule]);
+  }, [fetchTrainData, analyzeConflicts, predictConflicts, getOptimizedSchedule, saveSchedule]);
 
   // Start continuous optimization (same as Python decision_taker.py runContinuousOptimization)
   const startPolling = useCallback(() => {
@@ -664,6 +506,7 @@ Focus on the most critical trains first. Provide only the JSON response without
       // Additional check to ensure we don't run if already optimizing
       if (optimizingRef.current || !globalOptimizationEngineActive) {
         console.log('Previous optimization still running or engine stopped, skipping this cycle');
+        optimizationMetrics.skipCycle(optimizingRef.current ? 'in_progress' : 'inactive');
         return;
       }
 
@@ -711,30 +554,11 @@ Focus on the most critical trains first. Provide only the JSON response without
     console.log(`Groq AI optimization ${enabled && groqApiKey ? 'enabled' : 'disabled'}`);
   }, [groqApiKey]);
 
-  // Get saved schedules from local storage
-  const getSavedSchedules = useCallback(() => {
-    const schedules: Array<{key: string, schedule: OptimizationSchedule, timestamp: string}> = [];
-    
-    for (let i = 0; i < localStorage.length; i++) {
-      const key = localStorage.key(i);
-      if (key && key.startsWith('train_schedule_')) {
-        try {
-          const scheduleData = localStorage.getItem(key);
-          if (scheduleData) {
-            const schedule = JSON.parse(scheduleData);
-            schedules.push({
-              key,
-              schedule,
-              timestamp: new Date(schedule.now_epoch_s * 1000).toISOString()
-            });
-          }
-        } catch (error) {
-          console.warn(`Failed to parse saved schedule ${key}:`, error);
-        }
-      }
-    }
-    
-    return schedules.sort((a, b) => b.schedule.now_epoch_s - a.schedule.now_epoch_s);
+  // Get saved schedules from the local schedule log (newest first)
+  const getSavedSchedules = useCallback((query: ScheduleQuery = {}) => {
+    const store = getScheduleStore();
+    if (!store) return [];
+    return store.query(query).reverse();
   }, []);
 
   // Cleanup on unmount
@@ -755,6 +579,7 @@ Focus on the most critical trains first. Provide only the JSON response without
     toggleGroqAI,
     getSavedSchedules,
     fetchOptimizationResults,
+    fetchOptimizationHistory,
     // Helper functions for components
     getActionIcon: (action: string) => {
       if (action === 'proceed') return '✅';
@@ -1,7 +1,9 @@
+import { useEffect, useState } from 'react';
 import useSWR from 'swr';
-import { axiosInstance } from '@/lib/api';
+import { axiosInstance, API_BASE_URL } from '@/lib/api';
 import { TrainBundle } from '@/types';
 import { mockTrainData } from '@/lib/mockData';
+import { getTrainStream } from '@/lib/trainStream';
 
 const fetcher = async (url: string) => {
   try {
@@ -14,11 +16,14 @@ const fetcher = async (url: string) => {
 };
 
 export const useTrainData = (refreshInterval = 30000) => { // Reduced to 30 seconds to avoid conflicts with optimization engine
+  const [isStreaming, setIsStreaming] = useState(false);
+
   const { data, error, mutate, isLoading } = useSWR<{ payload: TrainBundle[] }>(
     '/api/train-data',
     fetcher,
     {
-      refreshInterval,
+      // Polling is only a fallback while the /ws/train-data stream is down
+      refreshInterval: isStreaming ? 0 : refreshInterval,
       fallbackData: { payload: mockTrainData },
       onError: (err) => {
         console.warn('Train data fetch failed:', err.message);
@@ -28,12 +33,27 @@ export const useTrainData = (refreshInterval = 30000) => { // Reduced to 30 seco
     }
   );
 
+  // Push stream updates into the SWR cache so every consumer shares one socket
+  useEffect(() => {
+    const stream = getTrainStream(API_BASE_URL);
+    const unsubscribe = stream.subscribe(({ trains }) => {
+      setIsStreaming(true);
+      mutate({ payload: trains }, { revalidate: false });
+    });
+    const liveCheck = setInterval(() => setIsStreaming(stream.isLive), 5000);
+    return () => {
+      clearInterval(liveCheck);
+      unsubscribe();
+    };
+  }, [mutate]);
+
   return {
     trainData: data?.payload || mockTrainData,
     isLoading,
     isError: error,
+    isStreaming,
     mutate,
   };
 };
 
-export default useTrainData;
\ No newline at end of file
+export default useTrainData;
@@ -1,6 +1,6 @@
 import axios from 'axios';
 
-const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'https://sih-backend-1-x9tg.onrender.com';
+export const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'https://sih-backend-1-x9tg.onrender.com';
 
 export const axiosInstance = axios.create({
   baseURL: API_BASE_URL,
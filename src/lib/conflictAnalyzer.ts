@@ -0,0 +1,204 @@
+import { TrainBundle, Conflict } from '@/types';
+import { Topology } from '@/lib/topology';
+
+// Incremental conflict analyzer (same rules as Python decision_taker.py analyze_conflicts).
+// Train state lives in slot-indexed typed arrays keyed by train_id; each poll only
+// moves the trains whose section or status changed, and conflicts are recomputed
+// only for the sections touched by those moves and their downstream neighbours.
+
+const INACTIVE_STATUSES = ['Arrived', 'Cancelled'];
+const NO_SECTION = -1;
+
+export class ConflictAnalyzer {
+  private readonly topology: Topology;
+  private readonly sectionIndex: Map<string, number>;
+  private readonly sectionIds: string[];
+  private readonly occupants: Set<number>[] = [];
+  private readonly sectionConflicts: Conflict[][] = [];
+  private readonly conflicted = new Set<number>();
+  private readonly dirty = new Set<number>();
+
+  private readonly trainSlots = new Map<string, number>();
+  private trainIds: (string | null)[] = [];
+  private trainSection = new Int32Array(64);
+  private trainSeen = new Uint32Array(64);
+  private readonly freeSlots: number[] = [];
+  private generation = 0;
+
+  constructor(topology: Topology) {
+    this.topology = topology;
+    this.sectionIndex = new Map(topology.sectionIndex);
+    this.sectionIds = topology.sections.map(section => section.section_id);
+    this.sectionIds.forEach(() => {
+      this.occupants.push(new Set());
+      this.sectionConflicts.push([]);
+    });
+  }
+
+  get trainCount(): number {
+    return this.trainSlots.size;
+  }
+
+  // Apply a full snapshot: changed trains are moved, missing trains are dropped
+  update(trains: TrainBundle[]): void {
+    this.generation++;
+    trains.forEach(bundle => this.applyTrain(bundle));
+    for (let slot = 0; slot < this.trainIds.length; slot++) {
+      if (this.trainIds[slot] !== null && this.trainSeen[slot] !== this.generation) {
+        this.removeSlot(slot);
+      }
+    }
+  }
+
+  // Apply a partial update without touching trains that are not mentioned
+  applyChanges(changed: TrainBundle[], removedTrainIds: string[] = []): void {
+    this.generation++;
+    changed.forEach(bundle => this.applyTrain(bundle));
+    removedTrainIds.forEach(trainId => {
+      const slot = this.trainSlots.get(trainId);
+      if (slot !== undefined) this.removeSlot(slot);
+    });
+  }
+
+  conflicts(): Conflict[] {
+    this.dirty.forEach(section => this.recompute(section));
+    this.dirty.clear();
+
+    const sections = Array.from(this.conflicted).sort((a, b) => a - b);
+    const capacityConflicts: Conflict[] = [];
+    const trackConflicts: Conflict[] = [];
+    sections.forEach(section => {
+      this.sectionConflicts[section].forEach(conflict => {
+        (conflict.type === 'capacity_exceeded' ? capacityConflicts : trackConflicts).push(conflict);
+      });
+    });
+    return capacityConflicts.concat(trackConflicts);
+  }
+
+  private applyTrain(bundle: TrainBundle): void {
+    const train = bundle.train;
+    let slot = this.trainSlots.get(train.train_id);
+    if (slot === undefined) {
+      slot = this.allocateSlot(train.train_id);
+    }
+    this.trainSeen[slot] = this.generation;
+
+    const sectionId = train.current_location?.section_id;
+    const section = sectionId && !INACTIVE_STATUSES.includes(train.status)
+      ? this.sectionSlot(sectionId)
+      : NO_SECTION;
+    this.moveTrain(slot, section);
+  }
+
+  private allocateSlot(trainId: string): number {
+    const slot = this.freeSlots.length > 0 ? this.freeSlots.pop()! : this.trainIds.length;
+    if (slot === this.trainIds.length) {
+      this.trainIds.push(trainId);
+      if (slot >= this.trainSection.length) {
+        const section = new Int32Array(this.trainSection.length * 2);
+        section.set(this.trainSection);
+        this.trainSection = section;
+        const seen = new Uint32Array(this.trainSeen.length * 2);
+        seen.set(this.trainSeen);
+        this.trainSeen = seen;
+      }
+    } else {
+      this.trainIds[slot] = trainId;
+    }
+    this.trainSection[slot] = NO_SECTION;
+    this.trainSlots.set(trainId, slot);
+    return slot;
+  }
+
+  private removeSlot(slot: number): void {
+    this.moveTrain(slot, NO_SECTION);
+    this.trainSlots.delete(this.trainIds[slot]!);
+    this.trainIds[slot] = null;
+    this.freeSlots.push(slot);
+  }
+
+  private moveTrain(slot: number, section: number): void {
+    const previous = this.trainSection[slot];
+    if (previous === section) return;
+    if (previous !== NO_SECTION) {
+      this.occupants[previous].delete(slot);
+      this.markDirty(previous);
+    }
+    if (section !== NO_SECTION) {
+      this.occupants[section].add(slot);
+      this.markDirty(section);
+    }
+    this.trainSection[slot] = section;
+  }
+
+  // Sections outside the topology are tracked with capacity 1 and no neighbours
+  private sectionSlot(sectionId: string): number {
+    let section = this.sectionIndex.get(sectionId);
+    if (section === undefined) {
+      section = this.sectionIds.length;
+      this.sectionIndex.set(sectionId, section);
+      this.sectionIds.push(sectionId);
+      this.occupants.push(new Set());
+      this.sectionConflicts.push([]);
+    }
+    return section;
+  }
+
+  private markDirty(section: number): void {
+    this.dirty.add(section);
+    // Trains in this section are the approaching trains for its successors
+    if (section < this.topology.next.length) {
+      this.topology.next[section].forEach(next => this.dirty.add(next));
+    }
+  }
+
+  private trainIdsIn(section: number): string[] {
+    const ids: string[] = [];
+    this.occupants[section].forEach(slot => ids.push(this.trainIds[slot]!));
+    return ids;
+  }
+
+  private recompute(section: number): void {
+    const conflicts: Conflict[] = [];
+    const sectionId = this.sectionIds[section];
+    const occupied = this.occupants[section];
+    const capacity = section < this.topology.capacity.length ? this.topology.capacity[section] : 1;
+
+    // Check for capacity violations
+    if (occupied.size > capacity) {
+      conflicts.push({
+        type: 'capacity_exceeded',
+        section: sectionId,
+        capacity,
+        current_trains: this.trainIdsIn(section),
+        severity: 'high'
+      });
+    }
+
+    // Check for potential collisions in single-track sections
+    if (capacity === 1 && occupied.size > 0 && section < this.topology.prev.length) {
+      const approaching: string[] = [];
+      this.topology.prev[section].forEach(prev => {
+        this.occupants[prev].forEach(slot => approaching.push(this.trainIds[slot]!));
+      });
+      if (approaching.length > 0) {
+        conflicts.push({
+          type: 'single_track_conflict',
+          section: sectionId,
+          occupied_by: this.trainIdsIn(section),
+          approaching,
+          severity: 'medium'
+        });
+      }
+    }
+
+    this.sectionConflicts[section] = conflicts;
+    if (conflicts.length > 0) {
+      this.conflicted.add(section);
+    } else {
+      this.conflicted.delete(section);
+    }
+  }
+}
+
+export default ConflictAnalyzer;
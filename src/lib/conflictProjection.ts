@@ -0,0 +1,165 @@
+import { TrainBundle, Conflict } from '@/types';
+import { Topology } from '@/lib/topology';
+
+// Forward projection of section occupancy over the optimization horizon.
+// Every active train is advanced along its path at min(train, line) speed, giving
+// [entry, exit) intervals per section in flat typed-array columns. Intervals are
+// bucketed by section, sorted by entry time and swept to find where occupancy
+// (padded by the signal headway) would exceed section capacity.
+
+export interface ProjectionOptions {
+  horizonS?: number;
+  defaultHeadwayS?: number;
+  maxSectionsPerTrain?: number;
+}
+
+const INACTIVE_STATUSES = ['Arrived', 'Cancelled'];
+const DEFAULT_SPEED_KMH = 100;
+
+// Growable column of interval data
+class IntervalColumns {
+  count = 0;
+  section = new Int32Array(1024);
+  train = new Int32Array(1024);
+  start = new Float64Array(1024);
+  end = new Float64Array(1024);
+
+  push(section: number, train: number, start: number, end: number): void {
+    if (this.count === this.section.length) {
+      const size = this.count * 2;
+      const grow = <T extends Int32Array | Float64Array>(column: T, next: T): T => {
+        next.set(column);
+        return next;
+      };
+      this.section = grow(this.section, new Int32Array(size));
+      this.train = grow(this.train, new Int32Array(size));
+      this.start = grow(this.start, new Float64Array(size));
+      this.end = grow(this.end, new Float64Array(size));
+    }
+    this.section[this.count] = section;
+    this.train[this.count] = train;
+    this.start[this.count] = start;
+    this.end[this.count] = end;
+    this.count++;
+  }
+}
+
+const severityFor = (timeToConflictS: number): string =>
+  timeToConflictS < 300 ? 'high' : timeToConflictS < 900 ? 'medium' : 'low';
+
+export const projectConflicts = (
+  trains: TrainBundle[],
+  topology: Topology,
+  options: ProjectionOptions = {}
+): Conflict[] => {
+  const { horizonS = 3600, defaultHeadwayS = 120, maxSectionsPerTrain = 64 } = options;
+  const sectionCount = topology.sections.length;
+
+  // Per-section headway and line speed from the signalling data
+  const headway = new Float64Array(sectionCount).fill(defaultHeadwayS);
+  const lineSpeedKmh = new Float64Array(sectionCount).fill(Infinity);
+  trains.forEach(bundle => {
+    const signalSlot = topology.sectionIndex.get(bundle.signal?.section_id);
+    if (signalSlot !== undefined && bundle.signal.headway_time_s) {
+      headway[signalSlot] = bundle.signal.headway_time_s;
+    }
+    const sectionSlot = topology.sectionIndex.get(bundle.section?.section_id);
+    if (sectionSlot !== undefined && bundle.section.max_speed_kmh) {
+      lineSpeedKmh[sectionSlot] = bundle.section.max_speed_kmh;
+    }
+  });
+
+  // Train columns for trains on a known section
+  const trainIds: string[] = [];
+  const location: number[] = [];
+  const position: number[] = [];
+  const maxSpeed: number[] = [];
+  const forward: boolean[] = [];
+  trains.forEach(bundle => {
+    const train = bundle.train;
+    if (INACTIVE_STATUSES.includes(train.status)) return;
+    const slot = topology.sectionIndex.get(train.current_location?.section_id);
+    if (slot === undefined) return;
+    trainIds.push(train.train_id);
+    location.push(slot);
+    position.push(train.current_location.position_m || 0);
+    maxSpeed.push(train.max_speed_kmh || DEFAULT_SPEED_KMH);
+    forward.push(train.direction !== 'backward');
+  });
+
+  // Advance every train section by section until it leaves the horizon
+  const intervals = new IntervalColumns();
+  for (let t = 0; t < trainIds.length; t++) {
+    let section = location[t];
+    const lengthM = topology.lengthKm[section] * 1000;
+    let remainingM = forward[t] ? lengthM - position[t] : position[t];
+    let clock = 0;
+
+    for (let hop = 0; hop < maxSectionsPerTrain && clock < horizonS; hop++) {
+      const speedMs = Math.min(maxSpeed[t], lineSpeedKmh[section]) / 3.6;
+      const exit = clock + Math.max(0, remainingM) / Math.max(speedMs, 0.1);
+      intervals.push(section, t, clock, exit);
+
+      const neighbours = forward[t] ? topology.next[section] : topology.prev[section];
+      if (neighbours.length === 0) break;
+      section = neighbours[0];
+      remainingM = topology.lengthKm[section] * 1000;
+      clock = exit;
+    }
+  }
+
+  // Bucket intervals by section (counting sort), then order each bucket by entry time
+  const offsets = new Int32Array(sectionCount + 1);
+  for (let i = 0; i < intervals.count; i++) offsets[intervals.section[i] + 1]++;
+  for (let s = 0; s < sectionCount; s++) offsets[s + 1] += offsets[s];
+  const order = new Int32Array(intervals.count);
+  const cursor = offsets.slice(0, sectionCount);
+  for (let i = 0; i < intervals.count; i++) order[cursor[intervals.section[i]]++] = i;
+
+  const conflicts: Conflict[] = [];
+  for (let s = 0; s < sectionCount; s++) {
+    const from = offsets[s];
+    const to = offsets[s + 1];
+    if (to - from < 2) continue;
+
+    const bucket = Array.from(order.subarray(from, to)).sort(
+      (a, b) => intervals.start[a] - intervals.start[b]
+    );
+    const capacity = topology.capacity[s];
+    const padding = headway[s];
+    const active: number[] = [];
+    let inConflict = false;
+
+    for (const i of bucket) {
+      const start = intervals.start[i];
+      // Drop trains that have cleared the section plus headway before this entry
+      for (let k = active.length - 1; k >= 0; k--) {
+        if (intervals.end[active[k]] + padding <= start) active.splice(k, 1);
+      }
+      active.push(i);
+
+      if (active.length <= capacity) {
+        inConflict = false;
+        continue;
+      }
+      // One conflict per overlap episode; overlaps already present now are
+      // reported by the snapshot analyzer
+      if (inConflict || start <= 0) continue;
+      inConflict = true;
+
+      conflicts.push({
+        type: 'predicted_conflict',
+        section: topology.sections[s].section_id,
+        capacity,
+        occupied_by: active.filter(k => k !== i).map(k => trainIds[intervals.train[k]]),
+        approaching: [trainIds[intervals.train[i]]],
+        time_to_conflict_s: Math.round(start),
+        severity: severityFor(start),
+      });
+    }
+  }
+
+  return conflicts.sort((a, b) => (a.time_to_conflict_s ?? 0) - (b.time_to_conflict_s ?? 0));
+};
+
+export default projectConflicts;
@@ -0,0 +1,353 @@
+import { TrainBundle, Disruption, OptimizationSchedule, RerouteOption } from '@/types';
+import { Topology, defaultTopology } from '@/lib/topology';
+
+// Disruption impact index. Keeps a reverse index from section to the trains
+// occupying it, heading through it towards their destination or scheduled into it,
+// maintained per changed train. Shortest paths over the station graph (sections as
+// undirected edges weighted by length, disrupted sections removed) are cached per
+// source station; a new disruption only drops the cached rows whose shortest-path
+// tree used the disrupted section, and a cleared one only the rows it would shorten.
+
+const INACTIVE_STATUSES = ['Arrived', 'Cancelled'];
+const MAX_PATH_HOPS = 16;
+const MAX_CACHED_ROWS = 1024;
+
+interface PathRow {
+  dist: Float64Array;
+  // Section slot used to reach each station, -1 for the source and unreachable stations
+  via: Int32Array;
+}
+
+interface TrainEntry {
+  current: number;
+  forward: boolean;
+  // Station the train reaches next and its destination; -1 when unknown
+  from: number;
+  to: number;
+  path: number[];
+}
+
+export class DisruptionIndex {
+  private readonly topology: Topology;
+  private readonly stationIndex = new Map<string, number>();
+  private readonly stationNames: string[] = [];
+  private readonly sectionFrom: Int32Array;
+  private readonly sectionTo: Int32Array;
+  private readonly adjacency: number[][] = [];
+  private readonly blocked: Uint8Array;
+  private readonly rows = new Map<number, PathRow>();
+
+  private readonly sectionTrains: Array<Set<string>>;
+  private readonly trainSections = new Map<string, number[]>();
+  private readonly trains = new Map<string, TrainEntry>();
+  private readonly scheduled = new Map<string, number>();
+
+  constructor(topology: Topology) {
+    this.topology = topology;
+    const count = topology.sections.length;
+    this.sectionFrom = new Int32Array(count);
+    this.sectionTo = new Int32Array(count);
+    this.blocked = new Uint8Array(count);
+    this.sectionTrains = topology.sections.map(() => new Set<string>());
+
+    topology.sections.forEach((section, slot) => {
+      const from = this.station(section.start_station);
+      const to = this.station(section.end_station);
+      this.sectionFrom[slot] = from;
+      this.sectionTo[slot] = to;
+      this.adjacency[from].push(slot);
+      if (to !== from) this.adjacency[to].push(slot);
+    });
+  }
+
+  // Re-index trains whose location or direction changed; trains missing from
+  // `trains` are dropped
+  updateTrains(trains: TrainBundle[]): void {
+    const seen = new Set<string>();
+    trains.forEach(bundle => {
+      const train = bundle.train;
+      if (INACTIVE_STATUSES.includes(train.status)) return;
+      const current = this.topology.sectionIndex.get(train.current_location?.section_id);
+      if (current === undefined) return;
+      seen.add(train.train_id);
+
+      const forward = train.direction !== 'backward';
+      const to = this.stationIndex.get(train.destination_station) ?? -1;
+      const previous = this.trains.get(train.train_id);
+      if (previous && previous.current === current && previous.forward === forward && previous.to === to) {
+        return;
+      }
+
+      this.trains.set(train.train_id, {
+        current,
+        forward,
+        from: forward ? this.sectionTo[current] : this.sectionFrom[current],
+        to,
+        path: this.pathAhead(current, forward, to),
+      });
+      this.reindex(train.train_id);
+    });
+
+    this.trains.forEach((_, trainId) => {
+      if (!seen.has(trainId)) {
+        this.trains.delete(trainId);
+        this.reindex(trainId);
+      }
+    });
+  }
+
+  // Index the sections each train is scheduled to enter next
+  updateSchedule(schedule: OptimizationSchedule | null | undefined): void {
+    const entries = schedule?.schedule || {};
+    const changed: string[] = [];
+    Object.keys(entries).forEach(trainId => {
+      const slot = this.topology.sectionIndex.get(entries[trainId].target_section);
+      if (slot === undefined || this.scheduled.get(trainId) === slot) return;
+      this.scheduled.set(trainId, slot);
+      changed.push(trainId);
+    });
+    this.scheduled.forEach((_, trainId) => {
+      if (!entries[trainId]) {
+        this.scheduled.delete(trainId);
+        changed.push(trainId);
+      }
+    });
+    changed.forEach(trainId => this.reindex(trainId));
+  }
+
+  // Replace the set of disrupted sections, invalidating only the affected path rows
+  setDisrupted(sectionIds: string[]): void {
+    const next = new Uint8Array(this.blocked.length);
+    sectionIds.forEach(sectionId => {
+      const slot = this.topology.sectionIndex.get(sectionId);
+      if (slot !== undefined) next[slot] = 1;
+    });
+
+    for (let slot = 0; slot < next.length; slot++) {
+      if (next[slot] === this.blocked[slot]) continue;
+      this.blocked[slot] = next[slot];
+      const u = this.sectionFrom[slot];
+      const v = this.sectionTo[slot];
+      const length = this.topology.lengthKm[slot];
+
+      this.rows.forEach((row, source) => {
+        const stale = next[slot]
+          // Blocked: only rows whose shortest-path tree runs through this section
+          ? row.via[u] === slot || row.via[v] === slot
+          // Reopened: only rows where this section shortens the path to either end
+          : row.dist[u] + length < row.dist[v] || row.dist[v] + length < row.dist[u];
+        if (stale) this.rows.delete(source);
+      });
+    }
+  }
+
+  affectedTrains(sectionId: string): string[] {
+    const slot = this.topology.sectionIndex.get(sectionId);
+    return slot === undefined ? [] : Array.from(this.sectionTrains[slot]).sort();
+  }
+
+  // Paths around `sectionId`: one per distinct (next station, destination) of the
+  // trains heading through it, plus the direct bypass between its two stations
+  rerouteOptions(sectionId: string, limit = 5): RerouteOption[] {
+    const slot = this.topology.sectionIndex.get(sectionId);
+    if (slot === undefined) return [];
+
+    const options = new Map<string, RerouteOption>();
+    const addOption = (from: number, to: number, trainId?: string) => {
+      if (from < 0 || to < 0 || from === to) return;
+      const key = `${from}->${to}`;
+      let option = options.get(key);
+      if (!option) {
+        const path = this.shortestPath(from, to);
+        if (!path || path.sections.indexOf(slot) !== -1) return;
+        option = {
+          from_station: this.stationNames[from],
+          to_station: this.stationNames[to],
+          sections: path.sections.map(s => this.topology.sections[s].section_id),
+          length_km: Math.round(path.length * 10) / 10,
+          train_ids: [],
+        };
+        options.set(key, option);
+      }
+      if (trainId) option.train_ids.push(trainId);
+    };
+
+    this.sectionTrains[slot].forEach(trainId => {
+      const entry = this.trains.get(trainId);
+      // Trains already on the section cannot be rerouted around it
+      if (entry && entry.current !== slot) addOption(entry.from, entry.to, trainId);
+    });
+    addOption(this.sectionFrom[slot], this.sectionTo[slot]);
+
+    return Array.from(options.values())
+      .sort((a, b) => b.train_ids.length - a.train_ids.length || a.length_km - b.length_km)
+      .slice(0, limit);
+  }
+
+  private station(name: string): number {
+    let index = this.stationIndex.get(name);
+    if (index === undefined) {
+      index = this.stationNames.length;
+      this.stationIndex.set(name, index);
+      this.stationNames.push(name);
+      this.adjacency.push([]);
+    }
+    return index;
+  }
+
+  // Current section plus the sections ahead, up to the destination station
+  private pathAhead(current: number, forward: boolean, destination: number): number[] {
+    const path = [current];
+    let slot = current;
+    for (let hop = 0; hop < MAX_PATH_HOPS; hop++) {
+      const exit = forward ? this.sectionTo[slot] : this.sectionFrom[slot];
+      if (exit === destination) break;
+      const neighbours = forward ? this.topology.next[slot] : this.topology.prev[slot];
+      if (neighbours.length === 0 || path.indexOf(neighbours[0]) !== -1) break;
+      slot = neighbours[0];
+      path.push(slot);
+    }
+    return path;
+  }
+
+  private reindex(trainId: string): void {
+    const sections: number[] = [];
+    const entry = this.trains.get(trainId);
+    if (entry) {
+      sections.push(...entry.path);
+      const target = this.scheduled.get(trainId);
+      if (target !== undefined && sections.indexOf(target) === -1) sections.push(target);
+    }
+
+    const previous = this.trainSections.get(trainId) || [];
+    previous.forEach(slot => {
+      if (sections.indexOf(slot) === -1) this.sectionTrains[slot].delete(trainId);
+    });
+    sections.forEach(slot => this.sectionTrains[slot].add(trainId));
+
+    if (sections.length > 0) this.trainSections.set(trainId, sections);
+    else this.trainSections.delete(trainId);
+  }
+
+  private shortestPath(from: number, to: number): { sections: number[]; length: number } | null {
+    let row = this.rows.get(from);
+    if (!row) {
+      row = this.dijkstra(from);
+      if (this.rows.size >= MAX_CACHED_ROWS) {
+        this.rows.delete(this.rows.keys().next().value as number);
+      }
+      this.rows.set(from, row);
+    }
+    if (!isFinite(row.dist[to])) return null;
+
+    const sections: number[] = [];
+    for (let station = to; station !== from;) {
+      const slot = row.via[station];
+      sections.push(slot);
+      station = this.sectionFrom[slot] === station ? this.sectionTo[slot] : this.sectionFrom[slot];
+    }
+    return { sections: sections.reverse(), length: row.dist[to] };
+  }
+
+  private dijkstra(source: number): PathRow {
+    const count = this.stationNames.length;
+    const dist = new Float64Array(count).fill(Infinity);
+    const via = new Int32Array(count).fill(-1);
+    dist[source] = 0;
+
+    // Binary min-heap of stations keyed by tentative distance (lazy deletion)
+    const heapStation: number[] = [source];
+    const heapDist: number[] = [0];
+    const swap = (i: number, j: number) => {
+      const station = heapStation[i];
+      heapStation[i] = heapStation[j];
+      heapStation[j] = station;
+      const d = heapDist[i];
+      heapDist[i] = heapDist[j];
+      heapDist[j] = d;
+    };
+    const push = (station: number, d: number) => {
+      heapStation.push(station);
+      heapDist.push(d);
+      for (let i = heapDist.length - 1; i > 0;) {
+        const parent = (i - 1) >> 1;
+        if (heapDist[parent] <= heapDist[i]) break;
+        swap(i, parent);
+        i = parent;
+      }
+    };
+    const pop = (): number => {
+      const top = heapStation[0];
+      const lastStation = heapStation.pop()!;
+      const lastDist = heapDist.pop()!;
+      if (heapStation.length > 0) {
+        heapStation[0] = lastStation;
+        heapDist[0] = lastDist;
+        for (let i = 0; ;) {
+          const left = 2 * i + 1;
+          const right = left + 1;
+          let smallest = i;
+          if (left < heapDist.length && heapDist[left] < heapDist[smallest]) smallest = left;
+          if (right < heapDist.length && heapDist[right] < heapDist[smallest]) smallest = right;
+          if (smallest === i) break;
+          swap(i, smallest);
+          i = smallest;
+        }
+      }
+      return top;
+    };
+
+    const settled = new Uint8Array(count);
+    while (heapStation.length > 0) {
+      const station = pop();
+      if (settled[station]) continue;
+      settled[station] = 1;
+      this.adjacency[station].forEach(slot => {
+        if (this.blocked[slot]) return;
+        const other = this.sectionFrom[slot] === station ? this.sectionTo[slot] : this.sectionFrom[slot];
+        const d = dist[station] + this.topology.lengthKm[slot];
+        if (d < dist[other]) {
+          dist[other] = d;
+          via[other] = slot;
+          push(other, d);
+        }
+      });
+    }
+
+    return { dist, via };
+  }
+}
+
+const indexes = new WeakMap<Topology, DisruptionIndex>();
+
+export const getDisruptionIndex = (topology: Topology = defaultTopology): DisruptionIndex => {
+  let index = indexes.get(topology);
+  if (!index) {
+    index = new DisruptionIndex(topology);
+    indexes.set(topology, index);
+  }
+  return index;
+};
+
+// Fill in affected trains and reroutes the backend did not provide
+export const annotateDisruptions = (
+  disruptions: Disruption[],
+  trains: TrainBundle[],
+  schedule: OptimizationSchedule | null,
+  topology: Topology = defaultTopology
+): Disruption[] => {
+  const index = getDisruptionIndex(topology);
+  index.updateTrains(trains);
+  index.updateSchedule(schedule);
+  index.setDisrupted(disruptions.map(disruption => disruption.section_id));
+
+  return disruptions.map(disruption => ({
+    ...disruption,
+    affected_trains: disruption.affected_trains.length > 0
+      ? disruption.affected_trains
+      : index.affectedTrains(disruption.section_id),
+    reroute_options: disruption.reroute_options ?? index.rerouteOptions(disruption.section_id),
+  }));
+};
+
+export default getDisruptionIndex;
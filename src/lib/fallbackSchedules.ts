@@ -0,0 +1,144 @@
+import { TrainBundle, Conflict, OptimizationSchedule } from '@/types';
+import { defaultTopology } from '@/lib/topology';
+
+// Heuristic schedulers used when neither the solver nor the LLM produces a schedule
+
+// Generate intelligent fallback schedule (enhanced version of Python _generateFallbackSchedule)
+export const generateIntelligentFallbackSchedule = (
+  trains: TrainBundle[],
+  conflicts: Conflict[],
+  sectionCapacity: Record<string, number> = defaultTopology.sectionCapacity
+): OptimizationSchedule => {
+  const currentTime = new Date();
+  const currentEpoch = Math.floor(currentTime.getTime() / 1000);
+
+  const activeTrains = trains.filter(train => 
+    !['Arrived', 'Cancelled'].includes(train.train.status)
+  );
+
+  const schedule: Record<string, any> = {};
+  
+  // Sort by priority and analyze conflicts (more intelligent than simple fallback)
+  const sortedTrains = [...activeTrains].sort((a, b) => {
+    // First by priority (higher first)
+    const priorityDiff = (b.train.priority || 1) - (a.train.priority || 1);
+    if (priorityDiff !== 0) return priorityDiff;
+    
+    // Then by status (running trains first)
+    const statusOrder = { 'Running': 0, 'Delayed': 1, 'Stopped': 2, 'Boarding': 3 };
+    return (statusOrder[a.train.status as keyof typeof statusOrder] || 4) - 
+           (statusOrder[b.train.status as keyof typeof statusOrder] || 4);
+  });
+
+  // Track section occupancy for conflict resolution
+  const sectionOccupancy: Record<string, string[]> = {};
+  const sectionSchedule: Record<string, number> = {}; // Next available time for each section
+
+  sortedTrains.forEach((train, index) => {
+    const trainData = train.train;
+    const currentSection = trainData.current_location?.section_id || 'SEC_1';
+    
+    // Check for conflicts in current or target sections
+    const isInConflict = conflicts.some(conflict => 
+      conflict.current_trains?.includes(trainData.train_id) ||
+      conflict.approaching?.includes(trainData.train_id)
+    );
+
+    let action = 'proceed';
+    let entryTime = currentEpoch;
+    let targetSection = currentSection;
+
+    if (isInConflict) {
+      // Handle conflict resolution
+      const conflictingSection = conflicts.find(c => 
+        c.current_trains?.includes(trainData.train_id) || 
+        c.approaching?.includes(trainData.train_id)
+      );
+
+      if (conflictingSection) {
+        const sectionId = conflictingSection.section;
+        const capacity = sectionCapacity[sectionId] || 1;
+        const currentOccupancy = sectionOccupancy[sectionId]?.length || 0;
+
+        if (currentOccupancy >= capacity) {
+          // Hold train until section is available
+          const baseDelay = 60; // 1 minute base delay
+          const priorityDelay = Math.max(0, 5 - (trainData.priority || 1)) * 30; // Lower priority = more delay
+          const positionDelay = index * 15; // Sequential delay based on processing order
+          
+          const totalDelay = baseDelay + priorityDelay + positionDelay;
+          entryTime = currentEpoch + totalDelay;
+          action = `hold_until_${new Date((currentEpoch + totalDelay) * 1000).toISOString()}`;
+          
+          console.log(`Train ${trainData.train_id} delayed by ${totalDelay}s due to ${conflictingSection.type}`);
+        }
+      }
+    }
+
+    // Track section usage
+    if (!sectionOccupancy[targetSection]) {
+      sectionOccupancy[targetSection] = [];
+    }
+    sectionOccupancy[targetSection].push(trainData.train_id);
+    sectionSchedule[targetSection] = Math.max(sectionSchedule[targetSection] || currentEpoch, entryTime + 30);
+
+    schedule[trainData.train_id] = {
+      target_section: targetSection,
+      entry_offset_s: entryTime - currentEpoch,
+      entry_epoch_s: entryTime,
+      action: action,
+      priority: trainData.priority || 1,
+      status: isInConflict ? 'Conflict resolved' : 'Optimized'
+    };
+  });
+
+  return {
+    now_epoch_s: currentEpoch,
+    horizon_s: 3600,
+    snapshot_trains_considered: activeTrains.length,
+    schedule
+  };
+};
+
+// Generate simple fallback schedule (same as Python _generateFallbackSchedule)
+export const generateFallbackSchedule = (trains: TrainBundle[]): OptimizationSchedule => {
+  const currentTime = new Date();
+  const currentEpoch = Math.floor(currentTime.getTime() / 1000);
+
+  const activeTrains = trains.filter(train => 
+    !['Arrived', 'Cancelled'].includes(train.train.status)
+  );
+
+  const schedule: Record<string, any> = {};
+  let offset = 0;
+
+  // Sort by priority (higher first)
+  const sortedTrains = [...activeTrains].sort((a, b) => 
+    (b.train.priority || 1) - (a.train.priority || 1)
+  );
+
+  sortedTrains.forEach(train => {
+    const trainData = train.train;
+    const currentSection = trainData.current_location?.section_id || 'SEC_1';
+
+    schedule[trainData.train_id] = {
+      target_section: currentSection,
+      entry_offset_s: offset,
+      entry_epoch_s: currentEpoch + offset,
+      action: 'proceed',
+      priority: trainData.priority || 1,
+      status: trainData.status || 'On time'
+    };
+
+    offset += 30; // 30-second intervals
+  });
+
+  return {
+    now_epoch_s: currentEpoch,
+    horizon_s: 3600,
+    snapshot_trains_considered: activeTrains.length,
+    schedule
+  };
+};
+
+export default generateFallbackSchedule;
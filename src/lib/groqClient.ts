@@ -0,0 +1,73 @@
+import axios, { AxiosInstance } from 'axios';
+
+// Shared client for /api/groq-optimization. One axios instance per backend and a
+// process-wide concurrency limit, so multiple engine instances cannot flood the
+// backend with parallel LLM calls.
+
+export const GROQ_MAX_CONCURRENT_REQUESTS = 2;
+
+export interface GroqOptimizationRequest {
+  prompt: string;
+  fingerprint?: string;
+  model?: string;
+  temperature?: number;
+  max_tokens?: number;
+  top_p?: number;
+}
+
+const clients = new Map<string, AxiosInstance>();
+
+const getClient = (apiBaseUrl: string): AxiosInstance => {
+  let client = clients.get(apiBaseUrl);
+  if (!client) {
+    client = axios.create({
+      baseURL: apiBaseUrl,
+      timeout: 30000,
+      headers: { 'Content-Type': 'application/json' },
+    });
+    clients.set(apiBaseUrl, client);
+  }
+  return client;
+};
+
+let active = 0;
+const waiting: Array<() => void> = [];
+
+const acquire = (): Promise<void> => {
+  if (active < GROQ_MAX_CONCURRENT_REQUESTS) {
+    active++;
+    return Promise.resolve();
+  }
+  return new Promise(resolve => waiting.push(() => {
+    active++;
+    resolve();
+  }));
+};
+
+const release = () => {
+  active--;
+  const next = waiting.shift();
+  if (next) next();
+};
+
+// Returns the raw LLM message content
+export const requestGroqOptimization = async (
+  apiBaseUrl: string,
+  request: GroqOptimizationRequest
+): Promise<string> => {
+  await acquire();
+  try {
+    const response = await getClient(apiBaseUrl).post('/api/groq-optimization', {
+      model: "llama-3.3-70b-versatile",
+      temperature: 0.1,
+      max_tokens: 2048,
+      top_p: 0.9,
+      ...request,
+    });
+    return response.data?.content?.trim() || '';
+  } finally {
+    release();
+  }
+};
+
+export default requestGroqOptimization;
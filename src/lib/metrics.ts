@@ -0,0 +1,376 @@
+import { OptimizationHealth } from '@/types';
+
+// Instrumentation for the optimization cycle (decision_taker.py run_continuous_optimization).
+// Records per-stage latency histograms, fallback/parse-failure/skipped-cycle counters and
+// payload sizes in a small in-process registry that renders to the Prometheus text
+// format. A sampling profiler can be attached to capture traces of slow cycles only.
+
+export type OptimizationStage =
+  | 'fetch'
+  | 'conflict_analysis'
+  | 'prompt_build'
+  | 'llm_call'
+  | 'solver'
+  | 'fallback'
+  | 'save';
+
+export type SkipReason = 'too_soon' | 'in_progress' | 'inactive';
+
+export type PayloadKind = 'train_data' | 'stream_message' | 'prompt' | 'llm_response' | 'schedule';
+
+export type MetricLabels = Record<string, string>;
+
+export interface CounterSample {
+  name: string;
+  labels: MetricLabels;
+  value: number;
+}
+
+export interface HistogramSample {
+  name: string;
+  labels: MetricLabels;
+  // Upper bounds; counts has one extra slot for +Inf
+  buckets: number[];
+  counts: number[];
+  sum: number;
+  count: number;
+}
+
+export interface MetricsSnapshot {
+  counters: CounterSample[];
+  gauges: CounterSample[];
+  histograms: HistogramSample[];
+}
+
+export interface ProfilerSession {
+  stop(): Promise<unknown>;
+}
+
+export interface SlowCycleReport {
+  duration_ms: number;
+  stages_ms: Record<string, number>;
+  trace: unknown;
+}
+
+export interface SlowCycleProfiler {
+  thresholdMs: number;
+  // Called at the start of every cycle; return null to skip profiling this cycle
+  start(): ProfilerSession | null;
+  onSlowCycle(report: SlowCycleReport): void;
+}
+
+const STAGE_BUCKETS_S = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30];
+const SIZE_BUCKETS_BYTES = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216];
+
+const METRIC_HELP: Record<string, [string, string]> = {
+  optimization_stage_duration_seconds: ['histogram', 'Duration of each optimization cycle stage'],
+  optimization_cycle_duration_seconds: ['histogram', 'Duration of complete optimization cycles'],
+  optimization_payload_bytes: ['histogram', 'Size of payloads moved by the optimization cycle'],
+  optimization_cycles_total: ['counter', 'Optimization cycles run, by outcome'],
+  optimization_skipped_cycles_total: ['counter', 'Optimization cycles skipped by the scheduling guards'],
+  optimization_llm_fallbacks_total: ['counter', 'LLM optimizations that fell back to the schedule solver'],
+  optimization_llm_parse_failures_total: ['counter', 'LLM responses without a valid schedule'],
+  optimization_slow_cycles_total: ['counter', 'Optimization cycles slower than the profiler threshold'],
+  optimization_last_cycle_trains: ['gauge', 'Trains processed by the last optimization cycle'],
+  optimization_last_cycle_conflicts: ['gauge', 'Conflicts found by the last optimization cycle'],
+  optimization_last_cycle_timestamp_seconds: ['gauge', 'Unix time the last optimization cycle finished'],
+};
+
+const now = (): number => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+
+const seriesKey = (name: string, labels: MetricLabels): string =>
+  `${name}{${Object.keys(labels).sort().map(key => `${key}=${labels[key]}`).join(',')}}`;
+
+// Value at quantile q, interpolated within the bucket holding it
+const histogramQuantile = (histogram: HistogramSample, q: number): number => {
+  if (histogram.count === 0) return 0;
+  const rank = q * histogram.count;
+  let cumulative = 0;
+  for (let i = 0; i < histogram.counts.length; i++) {
+    const previous = cumulative;
+    cumulative += histogram.counts[i];
+    if (cumulative >= rank) {
+      if (i === histogram.buckets.length) return histogram.buckets[i - 1];
+      const lower = i === 0 ? 0 : histogram.buckets[i - 1];
+      const upper = histogram.buckets[i];
+      return lower + (upper - lower) * ((rank - previous) / Math.max(histogram.counts[i], 1));
+    }
+  }
+  return histogram.buckets[histogram.buckets.length - 1];
+};
+
+export class MetricsRegistry {
+  private readonly counters = new Map<string, CounterSample>();
+  private readonly gauges = new Map<string, CounterSample>();
+  private readonly histograms = new Map<string, HistogramSample>();
+  private profiler: SlowCycleProfiler | null = null;
+  private cycle: { start: number; stages: Record<string, number>; session: ProfilerSession | null } | null = null;
+
+  increment(name: string, labels: MetricLabels = {}, by = 1): void {
+    const key = seriesKey(name, labels);
+    const counter = this.counters.get(key);
+    if (counter) counter.value += by;
+    else this.counters.set(key, { name, labels, value: by });
+  }
+
+  setGauge(name: string, value: number, labels: MetricLabels = {}): void {
+    this.gauges.set(seriesKey(name, labels), { name, labels, value });
+  }
+
+  observe(name: string, value: number, labels: MetricLabels = {}, buckets = STAGE_BUCKETS_S): void {
+    const key = seriesKey(name, labels);
+    let histogram = this.histograms.get(key);
+    if (!histogram) {
+      histogram = { name, labels, buckets, counts: new Array<number>(buckets.length + 1).fill(0), sum: 0, count: 0 };
+      this.histograms.set(key, histogram);
+    }
+    let bucket = 0;
+    while (bucket < buckets.length && value > buckets[bucket]) bucket++;
+    histogram.counts[bucket]++;
+    histogram.sum += value;
+    histogram.count++;
+  }
+
+  observeStage(stage: OptimizationStage, seconds: number): void {
+    this.observe('optimization_stage_duration_seconds', seconds, { stage });
+    if (this.cycle) {
+      this.cycle.stages[stage] = (this.cycle.stages[stage] || 0) + seconds * 1000;
+    }
+  }
+
+  timeStage<T>(stage: OptimizationStage, fn: () => T): T {
+    const start = now();
+    try {
+      return fn();
+    } finally {
+      this.observeStage(stage, (now() - start) / 1000);
+    }
+  }
+
+  async timeStageAsync<T>(stage: OptimizationStage, fn: () => Promise<T>): Promise<T> {
+    const start = now();
+    try {
+      return await fn();
+    } finally {
+      this.observeStage(stage, (now() - start) / 1000);
+    }
+  }
+
+  observePayload(payload: PayloadKind, bytes: number): void {
+    this.observe('optimization_payload_bytes', bytes, { payload }, SIZE_BUCKETS_BYTES);
+  }
+
+  skipCycle(reason: SkipReason): void {
+    this.increment('optimization_skipped_cycles_total', { reason });
+  }
+
+  setSlowCycleProfiler(profiler: SlowCycleProfiler | null): void {
+    this.profiler = profiler;
+  }
+
+  beginCycle(): void {
+    let session: ProfilerSession | null = null;
+    try {
+      session = this.profiler ? this.profiler.start() : null;
+    } catch (error) {
+      console.warn('Failed to start cycle profiler:', error);
+    }
+    this.cycle = { start: now(), stages: {}, session };
+  }
+
+  endCycle(outcome: 'success' | 'error', trains = 0, conflicts = 0): void {
+    const cycle = this.cycle;
+    if (!cycle) return;
+    this.cycle = null;
+
+    const durationMs = now() - cycle.start;
+    if (this.profiler && durationMs >= this.profiler.thresholdMs) {
+      this.increment('optimization_slow_cycles_total');
+    }
+    this.observe('optimization_cycle_duration_seconds', durationMs / 1000);
+    this.increment('optimization_cycles_total', { outcome });
+    if (outcome === 'success') {
+      this.setGauge('optimization_last_cycle_trains', trains);
+      this.setGauge('optimization_last_cycle_conflicts', conflicts);
+      this.setGauge('optimization_last_cycle_timestamp_seconds', Math.floor(Date.now() / 1000));
+    }
+
+    const profiler = this.profiler;
+    if (!cycle.session || !profiler) return;
+    // Traces of fast cycles are discarded; only slow ones are reported
+    cycle.session.stop().then(trace => {
+      if (durationMs >= profiler.thresholdMs) {
+        profiler.onSlowCycle({ duration_ms: Math.round(durationMs), stages_ms: cycle.stages, trace });
+      }
+    }).catch(error => {
+      console.warn('Failed to collect cycle profile:', error);
+    });
+  }
+
+  snapshot(): MetricsSnapshot {
+    const copy = (sample: CounterSample) => ({ ...sample });
+    return {
+      counters: Array.from(this.counters.values()).map(copy),
+      gauges: Array.from(this.gauges.values()).map(copy),
+      histograms: Array.from(this.histograms.values()).map(h => ({ ...h, counts: h.counts.slice() })),
+    };
+  }
+
+  // Summary for the extended /health response
+  health(): OptimizationHealth {
+    const sumCounter = (name: string) => Array.from(this.counters.values())
+      .filter(counter => counter.name === name)
+      .reduce((total, counter) => total + counter.value, 0);
+    const gauge = (name: string) => this.gauges.get(seriesKey(name, {}))?.value;
+
+    const stages: OptimizationHealth['stages'] = {};
+    this.histograms.forEach(histogram => {
+      if (histogram.name !== 'optimization_stage_duration_seconds') return;
+      stages[histogram.labels.stage] = {
+        count: histogram.count,
+        p50_ms: Math.round(histogramQuantile(histogram, 0.5) * 1000),
+        p99_ms: Math.round(histogramQuantile(histogram, 0.99) * 1000),
+      };
+    });
+
+    const lastCycle = gauge('optimization_last_cycle_timestamp_seconds');
+    return {
+      cycles_total: sumCounter('optimization_cycles_total'),
+      skipped_cycles_total: sumCounter('optimization_skipped_cycles_total'),
+      llm_fallbacks_total: sumCounter('optimization_llm_fallbacks_total'),
+      llm_parse_failures_total: sumCounter('optimization_llm_parse_failures_total'),
+      last_cycle_at: lastCycle ? new Date(lastCycle * 1000).toISOString() : null,
+      last_cycle_trains: gauge('optimization_last_cycle_trains') ?? 0,
+      stages,
+    };
+  }
+}
+
+const LABEL_NAME = /^[a-zA-Z_][a-zA-Z0-9_]*$/;
+const MAX_SAMPLES = 500;
+const MAX_LABELS = 8;
+const MAX_LABEL_VALUE_LENGTH = 128;
+// Added by the exposition itself and never accepted from a snapshot
+const RESERVED_LABELS = ['le', 'instance'];
+
+const isFiniteNumber = (value: unknown): value is number =>
+  typeof value === 'number' && isFinite(value);
+
+const sanitizeLabels = (labels: unknown): MetricLabels | null => {
+  if (!labels || typeof labels !== 'object' || Array.isArray(labels)) return null;
+  const keys = Object.keys(labels);
+  if (keys.length > MAX_LABELS) return null;
+  const clean: MetricLabels = {};
+  for (const key of keys) {
+    const value = (labels as Record<string, unknown>)[key];
+    if (!LABEL_NAME.test(key) || RESERVED_LABELS.indexOf(key) !== -1) return null;
+    if (typeof value !== 'string' || value.length > MAX_LABEL_VALUE_LENGTH) return null;
+    clean[key] = value;
+  }
+  return clean;
+};
+
+const sanitizeSample = (sample: unknown, type: string): CounterSample | null => {
+  if (!sample || typeof sample !== 'object') return null;
+  const { name, labels, value } = sample as Record<string, unknown>;
+  if (typeof name !== 'string' || METRIC_HELP[name]?.[0] !== type || !isFiniteNumber(value)) return null;
+  const cleanLabels = sanitizeLabels(labels);
+  return cleanLabels ? { name, labels: cleanLabels, value } : null;
+};
+
+const sanitizeHistogram = (sample: unknown): HistogramSample | null => {
+  if (!sample || typeof sample !== 'object') return null;
+  const { name, labels, buckets, counts, sum, count } = sample as Record<string, unknown>;
+  if (typeof name !== 'string' || METRIC_HELP[name]?.[0] !== 'histogram') return null;
+  if (!Array.isArray(buckets) || !Array.isArray(counts) || counts.length !== buckets.length + 1) return null;
+  if (buckets.length > 64 || !buckets.every((bound, i) => isFiniteNumber(bound) && (i === 0 || bound > buckets[i - 1]))) {
+    return null;
+  }
+  if (!counts.every(value => isFiniteNumber(value) && value >= 0) || !isFiniteNumber(sum) || !isFiniteNumber(count)) {
+    return null;
+  }
+  const cleanLabels = sanitizeLabels(labels);
+  return cleanLabels
+    ? { name, labels: cleanLabels, buckets: buckets as number[], counts: counts as number[], sum, count }
+    : null;
+};
+
+// Validate an untrusted snapshot (e.g. POSTed to /metrics): only known metric names
+// of the right type, Prometheus label names and finite values are accepted
+export const sanitizeSnapshot = (input: unknown): MetricsSnapshot | null => {
+  if (!input || typeof input !== 'object') return null;
+  const { counters, gauges, histograms } = input as Record<string, unknown>;
+  if (!Array.isArray(counters) || !Array.isArray(gauges) || !Array.isArray(histograms)) return null;
+  if (counters.length + gauges.length + histograms.length > MAX_SAMPLES) return null;
+
+  const clean: MetricsSnapshot = {
+    counters: counters.map(sample => sanitizeSample(sample, 'counter')).filter(Boolean) as CounterSample[],
+    gauges: gauges.map(sample => sanitizeSample(sample, 'gauge')).filter(Boolean) as CounterSample[],
+    histograms: histograms.map(sanitizeHistogram).filter(Boolean) as HistogramSample[],
+  };
+  const accepted = clean.counters.length + clean.gauges.length + clean.histograms.length;
+  return accepted === counters.length + gauges.length + histograms.length ? clean : null;
+};
+
+const escapeLabel = (value: string) => value.replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+
+const formatLabels = (labels: MetricLabels): string => {
+  const keys = Object.keys(labels);
+  return keys.length === 0 ? '' : `{${keys.map(key => `${key}="${escapeLabel(labels[key])}"`).join(',')}}`;
+};
+
+// Prometheus text exposition format (version 0.0.4) for one or more snapshots;
+// `labels` are added to every series of the matching snapshot (e.g. instance)
+export const renderPrometheus = (sources: Array<{ snapshot: MetricsSnapshot; labels?: MetricLabels }>): string => {
+  const families = new Map<string, string[]>();
+  const emit = (name: string, line: string) => {
+    if (!families.has(name)) families.set(name, []);
+    families.get(name)!.push(line);
+  };
+
+  sources.forEach(({ snapshot, labels = {} }) => {
+    snapshot.counters.concat(snapshot.gauges).forEach(sample => {
+      if (!METRIC_HELP[sample.name]) return;
+      emit(sample.name, `${sample.name}${formatLabels({ ...sample.labels, ...labels })} ${sample.value}`);
+    });
+    snapshot.histograms.forEach(histogram => {
+      if (!METRIC_HELP[histogram.name]) return;
+      const series = { ...histogram.labels, ...labels };
+      let cumulative = 0;
+      histogram.buckets.forEach((bound, i) => {
+        cumulative += histogram.counts[i];
+        emit(histogram.name, `${histogram.name}_bucket${formatLabels({ ...series, le: String(bound) })} ${cumulative}`);
+      });
+      emit(histogram.name, `${histogram.name}_bucket${formatLabels({ ...series, le: '+Inf' })} ${histogram.count}`);
+      emit(histogram.name, `${histogram.name}_sum${formatLabels(series)} ${histogram.sum}`);
+      emit(histogram.name, `${histogram.name}_count${formatLabels(series)} ${histogram.count}`);
+    });
+  });
+
+  const lines: string[] = [];
+  Array.from(families.keys()).sort().forEach(name => {
+    const [type, help] = METRIC_HELP[name];
+    lines.push(`# HELP ${name} ${help}`, `# TYPE ${name} ${type}`);
+    lines.push(...families.get(name)!);
+  });
+  return lines.length > 0 ? `${lines.join('\n')}\n` : '';
+};
+
+// Profiler sessions backed by the JS Self-Profiling API where the browser exposes it
+// (requires the `Document-Policy: js-profiling` response header)
+export const createSelfProfilerStart = (sampleIntervalMs = 10): (() => ProfilerSession | null) => () => {
+  const ProfilerConstructor = typeof window !== 'undefined'
+    ? (window as unknown as { Profiler?: new (options: { sampleInterval: number; maxBufferSize: number }) => ProfilerSession }).Profiler
+    : undefined;
+  if (!ProfilerConstructor) return null;
+  try {
+    return new ProfilerConstructor({ sampleInterval: sampleIntervalMs, maxBufferSize: 100000 });
+  } catch {
+    return null;
+  }
+};
+
+// Shared registry for the optimization engine
+export const optimizationMetrics = new MetricsRegistry();
+
+export default optimizationMetrics;
@@ -0,0 +1,254 @@
+import { TrainBundle, OptimizationSchedule, ScheduleEntry } from '@/types';
+import { Topology } from '@/lib/topology';
+import { solveSchedule, buildSectionTables, SolverOptions } from '@/lib/scheduleSolver';
+
+// Partitioned schedule solving for large networks. The section graph is cut where
+// trains enter multi-track sections (double/triple track and station approaches can
+// absorb a handoff), so every region is a multi-track head plus the single-track run
+// behind it. Regions are packed into batches of similar train counts, each batch is
+// solved independently (in a worker pool when one is available) and a merge pass
+// re-solves entries into sections targeted from more than one batch.
+
+export interface NetworkPartition {
+  // section slot -> region id
+  regionOf: Int32Array;
+  regionCount: number;
+}
+
+export interface RegionSolveRequest {
+  trains: TrainBundle[];
+  options: SolverOptions;
+}
+
+// Anything that can run solveSchedule for one batch against `topology`
+export interface RegionSolverPool {
+  size: number;
+  solve(topology: Topology, request: RegionSolveRequest): Promise<OptimizationSchedule>;
+}
+
+export interface PartitionedSolverOptions extends SolverOptions {
+  pool?: RegionSolverPool | null;
+  // Below this many active trains a single in-thread solve is cheaper than fanning
+  // out: with 4 worker_threads on the synthetic network the partitioned path was
+  // still slower at 40k trains (262ms single vs 1753ms), mostly message cloning
+  // and the merge pass
+  minParallelTrains?: number;
+}
+
+const INACTIVE_STATUSES = ['Arrived', 'Cancelled'];
+// Share of the time budget held back from the batches for the merge pass
+const MERGE_BUDGET_SHARE = 0.25;
+const UNKNOWN_REGION = -1;
+
+const partitionCache = new WeakMap<Topology, NetworkPartition>();
+
+export const partitionTopology = (topology: Topology): NetworkPartition => {
+  const cached = partitionCache.get(topology);
+  if (cached) return cached;
+
+  const count = topology.sections.length;
+  const parent = new Int32Array(count);
+  for (let s = 0; s < count; s++) parent[s] = s;
+  const find = (s: number): number => {
+    while (parent[s] !== s) {
+      parent[s] = parent[parent[s]];
+      s = parent[s];
+    }
+    return s;
+  };
+
+  for (let s = 0; s < count; s++) {
+    topology.next[s].forEach(n => {
+      if (topology.capacity[n] < 2) parent[find(n)] = find(s);
+    });
+  }
+
+  // Renumber roots densely
+  const regionOf = new Int32Array(count);
+  const roots = new Map<number, number>();
+  for (let s = 0; s < count; s++) {
+    const root = find(s);
+    if (!roots.has(root)) roots.set(root, roots.size);
+    regionOf[s] = roots.get(root)!;
+  }
+
+  const partition = { regionOf, regionCount: roots.size };
+  partitionCache.set(topology, partition);
+  return partition;
+};
+
+// Slot of the section a train will enter next (same rule as the solver)
+const targetSlot = (topology: Topology, bundle: TrainBundle): number | undefined => {
+  const slot = topology.sectionIndex.get(bundle.train.current_location?.section_id);
+  if (slot === undefined) return undefined;
+  const neighbours = bundle.train.direction === 'backward' ? topology.prev[slot] : topology.next[slot];
+  return neighbours.length > 0 ? neighbours[0] : slot;
+};
+
+const sliceSchedule = (
+  schedule: OptimizationSchedule | null | undefined,
+  trains: TrainBundle[]
+): OptimizationSchedule | null => {
+  if (!schedule?.schedule) return null;
+  const entries: Record<string, ScheduleEntry> = {};
+  trains.forEach(bundle => {
+    const entry = schedule.schedule[bundle.train.train_id];
+    if (entry) entries[bundle.train.train_id] = entry;
+  });
+  return { ...schedule, schedule: entries };
+};
+
+// Assign regions to batches, heaviest first onto the lightest batch
+const packRegions = (trainsPerRegion: number[], batchCount: number): Int32Array => {
+  const batchOf = new Int32Array(trainsPerRegion.length);
+  const load = new Array<number>(batchCount).fill(0);
+  const order = trainsPerRegion.map((_, region) => region).sort((a, b) => trainsPerRegion[b] - trainsPerRegion[a]);
+  order.forEach(region => {
+    let lightest = 0;
+    for (let b = 1; b < batchCount; b++) {
+      if (load[b] < load[lightest]) lightest = b;
+    }
+    batchOf[region] = lightest;
+    load[lightest] += trainsPerRegion[region];
+  });
+  return batchOf;
+};
+
+const inThreadPool: RegionSolverPool = {
+  size: 1,
+  solve: (topology, { trains, options }) => Promise.resolve(solveSchedule(trains, topology, options)),
+};
+
+export const solvePartitioned = async (
+  trains: TrainBundle[],
+  topology: Topology,
+  options: PartitionedSolverOptions = {}
+): Promise<OptimizationSchedule> => {
+  const { pool = null, minParallelTrains = 50000, ...solverOptions } = options;
+  const nowEpochS = solverOptions.nowEpochS ?? Math.floor(Date.now() / 1000);
+  // One budget for the whole solve: batches get what is left minus the merge
+  // reserve, the merge pass whatever remains after them
+  const timeBudgetMs = solverOptions.timeBudgetMs ?? 250;
+  const deadline = Date.now() + timeBudgetMs;
+  const remainingMs = (reserveMs = 0) => Math.max(0, deadline - Date.now() - reserveMs);
+  // Signalling data comes from every bundle, including inactive trains and trains
+  // in other batches, so each batch sees the real headway of the sections it enters
+  const baseOptions: SolverOptions = {
+    ...solverOptions,
+    timeBudgetMs,
+    nowEpochS,
+    sectionTables: solverOptions.sectionTables ?? buildSectionTables(trains),
+  };
+  const active = trains.filter(bundle => !INACTIVE_STATUSES.includes(bundle.train.status));
+
+  if (!pool || pool.size < 2 || active.length < minParallelTrains) {
+    return solveSchedule(trains, topology, baseOptions);
+  }
+
+  const partition = partitionTopology(topology);
+  const regionOfTrain = (bundle: TrainBundle): number => {
+    const slot = topology.sectionIndex.get(bundle.train.current_location?.section_id);
+    return slot === undefined ? UNKNOWN_REGION : partition.regionOf[slot];
+  };
+
+  const trainsPerRegion = new Array<number>(partition.regionCount).fill(0);
+  active.forEach(bundle => {
+    const region = regionOfTrain(bundle);
+    if (region !== UNKNOWN_REGION) trainsPerRegion[region]++;
+  });
+  const batchCount = Math.max(1, Math.min(pool.size, trainsPerRegion.filter(n => n > 0).length));
+  const batchOfRegion = packRegions(trainsPerRegion, batchCount);
+  // Trains on sections missing from the topology go with the first batch
+  const batchOfTrain = (bundle: TrainBundle): number => {
+    const region = regionOfTrain(bundle);
+    return region === UNKNOWN_REGION ? 0 : batchOfRegion[region];
+  };
+
+  const batches: TrainBundle[][] = [];
+  for (let b = 0; b < batchCount; b++) batches.push([]);
+  active.forEach(bundle => batches[batchOfTrain(bundle)].push(bundle));
+
+  // Trains currently on each section, so batches see occupancy owned by other batches
+  const occupants: TrainBundle[][] = topology.sections.map(() => []);
+  active.forEach(bundle => {
+    const slot = topology.sectionIndex.get(bundle.train.current_location?.section_id);
+    if (slot !== undefined) occupants[slot].push(bundle);
+  });
+
+  const externalOccupants = (batch: TrainBundle[], isMember: (bundle: TrainBundle) => boolean): TrainBundle[] => {
+    const seen = new Set<number>();
+    const fixed: TrainBundle[] = [];
+    batch.forEach(bundle => {
+      const target = targetSlot(topology, bundle);
+      if (target === undefined || seen.has(target)) return;
+      seen.add(target);
+      occupants[target].forEach(occupant => {
+        if (!isMember(occupant)) fixed.push(occupant);
+      });
+    });
+    return fixed;
+  };
+
+  const results = await Promise.all(batches.map((batch, b) => {
+    const request: RegionSolveRequest = {
+      trains: batch,
+      options: {
+        ...baseOptions,
+        timeBudgetMs: remainingMs(timeBudgetMs * MERGE_BUDGET_SHARE),
+        previousSchedule: sliceSchedule(baseOptions.previousSchedule, batch),
+        fixedTrains: externalOccupants(batch, bundle => batchOfTrain(bundle) === b),
+      },
+    };
+    return pool.solve(topology, request).catch(error => {
+      console.warn('Region solver failed, solving batch in-thread:', error);
+      return inThreadPool.solve(topology, {
+        ...request,
+        options: { ...request.options, timeBudgetMs: remainingMs(timeBudgetMs * MERGE_BUDGET_SHARE) },
+      });
+    });
+  }));
+
+  const merged: OptimizationSchedule = {
+    now_epoch_s: nowEpochS,
+    horizon_s: baseOptions.horizonS ?? 3600,
+    snapshot_trains_considered: 0,
+    schedule: {},
+  };
+  results.forEach(result => {
+    merged.snapshot_trains_considered += result.snapshot_trains_considered;
+    Object.assign(merged.schedule, result.schedule);
+  });
+
+  // Merge pass: a section entered from more than one batch was scheduled without
+  // seeing the other batches' entries, so re-solve every entry into it together.
+  // Batch results are the warm start, so entries that still fit are kept as-is.
+  const targetBatches = new Map<number, number>();
+  const contested = new Set<number>();
+  active.forEach(bundle => {
+    const target = targetSlot(topology, bundle);
+    if (target === undefined) return;
+    const batch = batchOfTrain(bundle);
+    const seen = targetBatches.get(target);
+    if (seen === undefined) targetBatches.set(target, batch);
+    else if (seen !== batch) contested.add(target);
+  });
+
+  if (contested.size > 0) {
+    const handoffs = active.filter(bundle => {
+      const target = targetSlot(topology, bundle);
+      return target !== undefined && contested.has(target);
+    });
+    const handoffIds = new Set(handoffs.map(bundle => bundle.train.train_id));
+    const reconciled = solveSchedule(handoffs, topology, {
+      ...baseOptions,
+      timeBudgetMs: remainingMs(),
+      previousSchedule: merged,
+      fixedTrains: externalOccupants(handoffs, bundle => handoffIds.has(bundle.train.train_id)),
+    });
+    Object.assign(merged.schedule, reconciled.schedule);
+  }
+
+  return merged;
+};
+
+export default solvePartitioned;
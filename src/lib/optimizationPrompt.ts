@@ -0,0 +1,102 @@
+import { TrainBundle, Conflict } from '@/types';
+import { Topology, defaultTopology, describeTopology } from '@/lib/topology';
+
+// Create optimization prompt (exact same as Python decision_taker.py)
+export const createOptimizationPrompt = (
+  trains: TrainBundle[],
+  conflicts: Conflict[],
+  topology: Topology = defaultTopology,
+  predictedConflicts: Conflict[] = []
+): string => {
+  const currentTime = new Date();
+  const currentEpoch = Math.floor(currentTime.getTime() / 1000);
+
+  const activeTrains = trains.filter(train => 
+    !['Arrived', 'Cancelled'].includes(train.train.status)
+  );
+  const singleTrackSections = topology.sections
+    .filter(section => section.capacity === 1)
+    .map(section => section.section_id);
+
+  let prompt = `You are an expert railway traffic controller. Your task is to optimize train scheduling to minimize delays and conflicts.
+
+CURRENT SITUATION:
+- Current time: ${currentTime.toISOString()}
+- Current epoch: ${currentEpoch}
+- Total active trains: ${activeTrains.length}
+
+RAILWAY NETWORK:
+${describeTopology(topology)}
+
+CURRENT TRAINS:
+`;
+
+  activeTrains.forEach(train => {
+    const trainData = train.train;
+    const location = trainData.current_location || {};
+    prompt += `- ${trainData.train_id}: ${trainData.type || 'Unknown'} (Priority: ${trainData.priority || 1}) `;
+    prompt += `at ${location.section_id || 'Unknown'} position ${location.position_m || 0}m, `;
+    prompt += `Status: ${trainData.status || 'Unknown'}, `;
+    prompt += `Destination: ${trainData.destination_station || 'Unknown'}, `;
+    prompt += `Max Speed: ${trainData.max_speed_kmh || 100}km/h\n`;
+  });
+
+  if (conflicts.length > 0) {
+    prompt += '\nIDENTIFIED CONFLICTS:\n';
+    conflicts.forEach(conflict => {
+      prompt += `- ${conflict.type} at ${conflict.section}: ${JSON.stringify(conflict)}\n`;
+    });
+  }
+
+  if (predictedConflicts.length > 0) {
+    prompt += '\nPREDICTED CONFLICTS (soonest first):\n';
+    predictedConflicts.forEach(conflict => {
+      prompt += `- ${conflict.section} in ${conflict.time_to_conflict_s ?? 0}s: `;
+      prompt += `${(conflict.approaching || []).join(', ')} behind ${(conflict.occupied_by || []).join(', ')} `;
+      prompt += `(capacity ${conflict.capacity ?? 1}, ${conflict.severity})\n`;
+    });
+  }
+
+  prompt += `
+OPTIMIZATION OBJECTIVES:
+1. Prioritize high-priority trains (Express=5, Local=3, Freight=2)
+2. Minimize total delay time
+3. Avoid conflicts in single-track sections (${singleTrackSections.join(', ')})
+4. Optimize capacity utilization
+5. Consider train speeds and journey times
+
+CONSTRAINTS:
+- Single-track sections can only handle one train at a time
+- Trains cannot reverse direction
+- Higher priority trains should be scheduled first
+- Safety margins must be maintained
+
+Please generate an optimized schedule in the following JSON format:
+{
+  "now_epoch_s": ${currentEpoch},
+  "horizon_s": 3600,
+  "snapshot_trains_considered": ${activeTrains.length},
+  "schedule": {
+    "TRAIN_ID": {
+      "target_section": "SEC_X",
+      "entry_offset_s": 0,
+      "entry_epoch_s": ${currentEpoch},
+      "action": "proceed|hold_until_YYYY-MM-DDTHH:MM:SS|reroute",
+      "priority": 1-5,
+      "status": "On time|Delayed|Waiting"
+    }
+  }
+}
+
+Consider these actions:
+- "proceed": Allow immediate movement
+- "hold_until_TIMESTAMP": Hold train until specified time
+- "reroute": Use alternative path (SEC_6 as bypass)
+
+Focus on the most critical trains first. Provide only the JSON response without additional explanation.
+`;
+
+  return prompt;
+};
+
+export default createOptimizationPrompt;
@@ -0,0 +1,133 @@
+import { OptimizationSchedule } from '@/types';
+import { Topology, TopologyDefinition } from '@/lib/topology';
+import { RegionSolverPool, RegionSolveRequest } from '@/lib/networkPartition';
+
+// Web Worker pool that runs region batches of the partitioned solver off the main
+// thread. Each worker is sent the topology definition once and keeps it loaded.
+
+export interface RegionWorkerRequest extends RegionSolveRequest {
+  id: number;
+  topologyVersion: number;
+  topology?: TopologyDefinition;
+}
+
+export type RegionWorkerResponse =
+  | { id: number; schedule: OptimizationSchedule }
+  | { id: number; error: string };
+
+interface PendingJob {
+  request: RegionWorkerRequest;
+  definition: TopologyDefinition;
+  resolve: (schedule: OptimizationSchedule) => void;
+  reject: (error: Error) => void;
+}
+
+interface PooledWorker {
+  worker: Worker;
+  topologyVersion: number;
+  job: PendingJob | null;
+}
+
+const topologyVersions = new WeakMap<Topology, number>();
+let nextTopologyVersion = 1;
+
+const versionOf = (topology: Topology): number => {
+  let version = topologyVersions.get(topology);
+  if (version === undefined) {
+    version = nextTopologyVersion++;
+    topologyVersions.set(topology, version);
+  }
+  return version;
+};
+
+export class RegionWorkerPool implements RegionSolverPool {
+  readonly size: number;
+  private readonly workers: PooledWorker[] = [];
+  private readonly queue: PendingJob[] = [];
+  private nextId = 0;
+
+  constructor(size: number, createWorker: () => Worker) {
+    this.size = size;
+    for (let i = 0; i < size; i++) {
+      const pooled: PooledWorker = { worker: createWorker(), topologyVersion: 0, job: null };
+      pooled.worker.onmessage = (event: MessageEvent<RegionWorkerResponse>) => {
+        const job = pooled.job;
+        if (!job || job.request.id !== event.data.id) return;
+        if ('error' in event.data) job.reject(new Error(event.data.error));
+        else job.resolve(event.data.schedule);
+        this.release(pooled);
+      };
+      pooled.worker.onerror = event => {
+        event.preventDefault();
+        const job = pooled.job;
+        // The worker may not have loaded the topology before failing
+        pooled.topologyVersion = 0;
+        if (job) job.reject(new Error(event.message || 'Region solver worker error'));
+        this.release(pooled);
+      };
+      this.workers.push(pooled);
+    }
+  }
+
+  solve(topology: Topology, { trains, options }: RegionSolveRequest): Promise<OptimizationSchedule> {
+    return new Promise((resolve, reject) => {
+      const request: RegionWorkerRequest = {
+        id: this.nextId++,
+        topologyVersion: versionOf(topology),
+        trains,
+        options,
+      };
+      const job: PendingJob = { request, definition: { sections: topology.sections }, resolve, reject };
+      const idle = this.workers.filter(pooled => !pooled.job)[0];
+      if (idle) this.dispatch(idle, job);
+      else this.queue.push(job);
+    });
+  }
+
+  terminate(): void {
+    this.workers.forEach(pooled => {
+      pooled.worker.terminate();
+      if (pooled.job) pooled.job.reject(new Error('Region solver pool terminated'));
+      pooled.job = null;
+    });
+    this.queue.splice(0).forEach(job => job.reject(new Error('Region solver pool terminated')));
+  }
+
+  private dispatch(pooled: PooledWorker, job: PendingJob): void {
+    pooled.job = job;
+    const request = pooled.topologyVersion === job.request.topologyVersion
+      ? job.request
+      : { ...job.request, topology: job.definition };
+    pooled.topologyVersion = job.request.topologyVersion;
+    pooled.worker.postMessage(request);
+  }
+
+  private release(pooled: PooledWorker): void {
+    pooled.job = null;
+    const next = this.queue.shift();
+    if (next) this.dispatch(pooled, next);
+  }
+}
+
+let browserPool: RegionWorkerPool | null | undefined;
+
+// Shared pool sized to the machine, leaving a core for the UI; null during SSR or
+// where workers are unavailable, in which case the solver runs in-thread
+export const getRegionWorkerPool = (): RegionWorkerPool | null => {
+  if (browserPool !== undefined) return browserPool;
+  if (typeof window === 'undefined' || typeof Worker === 'undefined') return null;
+  try {
+    const cores = navigator.hardwareConcurrency || 2;
+    const size = Math.max(1, Math.min(4, cores - 1));
+    browserPool = new RegionWorkerPool(
+      size,
+      () => new Worker(new URL('../workers/regionSolver.worker.ts', import.meta.url))
+    );
+  } catch (error) {
+    console.warn('Region solver workers unavailable, solving in-thread:', error);
+    browserPool = null;
+  }
+  return browserPool;
+};
+
+export default getRegionWorkerPool;
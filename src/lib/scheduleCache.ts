@@ -0,0 +1,140 @@
+import { TrainBundle, Conflict, OptimizationSchedule, ScheduleEntry } from '@/types';
+
+// Fingerprint-keyed cache for LLM schedules. The fingerprint covers only the
+// optimization-relevant state (section, status, priority, direction, disruption
+// and conflicts), never wall-clock fields, so identical network states map to
+// the same key across cycles.
+
+const INACTIVE_STATUSES = ['Arrived', 'Cancelled'];
+
+// 53-bit string hash (cyrb53); collisions are negligible at cache sizes we keep
+const hashString = (input: string): string => {
+  let h1 = 0xdeadbeef;
+  let h2 = 0x41c6ce57;
+  for (let i = 0; i < input.length; i++) {
+    const ch = input.charCodeAt(i);
+    h1 = Math.imul(h1 ^ ch, 2654435761);
+    h2 = Math.imul(h2 ^ ch, 1597334677);
+  }
+  h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+  h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+  return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(16);
+};
+
+export const fingerprintState = (trains: TrainBundle[], conflicts: Conflict[]): string => {
+  const trainKeys = trains
+    .filter(bundle => !INACTIVE_STATUSES.includes(bundle.train.status))
+    .map(bundle => {
+      const train = bundle.train;
+      return [
+        train.train_id,
+        train.current_location?.section_id || '',
+        train.status,
+        train.priority || 1,
+        train.direction,
+        bundle.section?.is_disrupted ? 1 : 0,
+      ].join('|');
+    })
+    .sort();
+
+  // Predicted conflicts depend on position within a section, so they are keyed by
+  // type and section only; otherwise every poll would miss the cache
+  const conflictKeys = conflicts
+    .map(conflict => conflict.type === 'predicted_conflict'
+      ? `${conflict.type}|${conflict.section}`
+      : [
+        conflict.type,
+        conflict.section,
+        (conflict.current_trains || conflict.occupied_by || []).slice().sort().join(','),
+        (conflict.approaching || []).slice().sort().join(','),
+      ].join('|'))
+    .sort()
+    .filter((key, i, keys) => i === 0 || key !== keys[i - 1]);
+
+  return hashString(`${trainKeys.join(';')}#${conflictKeys.join(';')}`);
+};
+
+// Shift a cached schedule so its offsets are relative to `nowEpochS`
+export const rebaseSchedule = (schedule: OptimizationSchedule, nowEpochS: number): OptimizationSchedule => {
+  const rebased: Record<string, ScheduleEntry> = {};
+  Object.entries(schedule.schedule).forEach(([trainId, entry]) => {
+    const offset = entry.entry_offset_s ?? entry.entry_epoch_s - schedule.now_epoch_s;
+    const entryEpoch = nowEpochS + offset;
+    rebased[trainId] = {
+      ...entry,
+      entry_offset_s: offset,
+      entry_epoch_s: entryEpoch,
+      action: entry.action.startsWith('hold_until')
+        ? `hold_until_${new Date(entryEpoch * 1000).toISOString()}`
+        : entry.action,
+    };
+  });
+  return { ...schedule, now_epoch_s: nowEpochS, schedule: rebased };
+};
+
+interface CacheEntry {
+  schedule: OptimizationSchedule;
+  storedAt: number;
+}
+
+export class ScheduleCache {
+  private readonly entries = new Map<string, CacheEntry>();
+  private readonly maxEntries: number;
+  private readonly ttlMs: number;
+
+  constructor(maxEntries = 32, ttlMs = 5 * 60 * 1000) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+  }
+
+  get(fingerprint: string, nowEpochS: number = Math.floor(Date.now() / 1000)): OptimizationSchedule | null {
+    const entry = this.entries.get(fingerprint);
+    if (!entry) return null;
+    if (Date.now() - entry.storedAt > this.ttlMs) {
+      this.entries.delete(fingerprint);
+      return null;
+    }
+    // Re-insert to mark as most recently used
+    this.entries.delete(fingerprint);
+    this.entries.set(fingerprint, entry);
+    return rebaseSchedule(entry.schedule, nowEpochS);
+  }
+
+  set(fingerprint: string, schedule: OptimizationSchedule): void {
+    this.entries.delete(fingerprint);
+    this.entries.set(fingerprint, { schedule, storedAt: Date.now() });
+    if (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value;
+      if (oldest !== undefined) this.entries.delete(oldest);
+    }
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+}
+
+// Concurrent callers with the same key share one in-flight promise
+const inFlight = new Map<string, Promise<unknown>>();
+
+export const singleFlight = <T>(key: string, fn: () => Promise<T>): Promise<T> => {
+  const existing = inFlight.get(key);
+  if (existing) return existing as Promise<T>;
+
+  const promise = fn().then(
+    result => {
+      inFlight.delete(key);
+      return result;
+    },
+    error => {
+      inFlight.delete(key);
+      throw error;
+    }
+  );
+  inFlight.set(key, promise);
+  return promise;
+};
+
+export const scheduleCache = new ScheduleCache();
+
+export default scheduleCache;
@@ -0,0 +1,265 @@
+import { TrainBundle, OptimizationSchedule, ScheduleEntry } from '@/types';
+import { Topology } from '@/lib/topology';
+
+// Constraint-based schedule solver used in place of the per-cycle LLM call.
+// Models section capacity, single-track exclusivity and signal headways over the
+// optimization horizon, and warm-starts from the previous cycle's schedule so that
+// decisions stay stable between polls.
+
+export interface SolverOptions {
+  horizonS?: number;
+  timeBudgetMs?: number;
+  defaultHeadwayS?: number;
+  nowEpochS?: number;
+  previousSchedule?: OptimizationSchedule | null;
+  // Trains outside this solve whose current occupancy still constrains it
+  fixedTrains?: TrainBundle[];
+  // Precomputed per-section signalling data (see buildSectionTables); defaults to
+  // the tables built from `trains` and `fixedTrains`
+  sectionTables?: SectionTables;
+}
+
+export interface SectionTables {
+  headway: Record<string, number>;
+  speed: Record<string, number>;
+}
+
+interface Interval {
+  start: number;
+  end: number;
+  trainId: string;
+  // Trains already inside the section at snapshot time; only their exit matters
+  seeded?: boolean;
+}
+
+interface Job {
+  trainId: string;
+  priority: number;
+  status: string;
+  targetSection: string;
+  earliest: number;
+  traversal: number;
+  hint: number | null;
+  fixed: boolean;
+}
+
+const INACTIVE_STATUSES = ['Arrived', 'Cancelled'];
+const DEFAULT_SPEED_KMH = 100;
+const HOLD_TOLERANCE_S = 5;
+const JOB_BUDGET_CHECK = 1024;
+
+// Per-section headway and line speed as reported by the signalling data
+export const buildSectionTables = (trains: TrainBundle[]): SectionTables => {
+  const headway: Record<string, number> = {};
+  const speed: Record<string, number> = {};
+  trains.forEach(bundle => {
+    if (bundle.signal?.section_id && bundle.signal.headway_time_s) {
+      headway[bundle.signal.section_id] = bundle.signal.headway_time_s;
+    }
+    if (bundle.section?.section_id && bundle.section.max_speed_kmh) {
+      speed[bundle.section.section_id] = bundle.section.max_speed_kmh;
+    }
+  });
+  return { headway, speed };
+};
+
+// Seconds needed to cover `distanceM` metres at `speedKmh`
+const travelTime = (distanceM: number, speedKmh: number): number =>
+  Math.max(0, distanceM) / (Math.max(1, speedKmh) / 3.6);
+
+// Earliest start >= `earliest` at which a train can hold `sectionId` for `duration`
+// seconds without exceeding capacity or violating the headway to other entries.
+const findSlot = (
+  intervals: Interval[],
+  capacity: number,
+  headway: number,
+  earliest: number,
+  duration: number
+): number => {
+  const candidates = [earliest];
+  intervals.forEach(interval => {
+    if (interval.end >= earliest) candidates.push(interval.end);
+    if (!interval.seeded && interval.start + headway >= earliest) candidates.push(interval.start + headway);
+  });
+  candidates.sort((a, b) => a - b);
+
+  for (const start of candidates) {
+    if (isFeasible(intervals, capacity, headway, start, duration)) {
+      return start;
+    }
+  }
+  // Unreachable in practice: the latest interval end is always feasible
+  return candidates[candidates.length - 1];
+};
+
+const isFeasible = (
+  intervals: Interval[],
+  capacity: number,
+  headway: number,
+  start: number,
+  duration: number
+): boolean => {
+  const end = start + duration;
+  let overlapping = 0;
+  for (const interval of intervals) {
+    // Entries on the same section must be separated by the signal headway
+    if (!interval.seeded && Math.abs(interval.start - start) < headway) {
+      return false;
+    }
+    if (interval.start < end && interval.end > start) {
+      overlapping++;
+      if (overlapping >= capacity) return false;
+    }
+  }
+  return true;
+};
+
+export const solveSchedule = (
+  trains: TrainBundle[],
+  topology: Topology,
+  options: SolverOptions = {}
+): OptimizationSchedule => {
+  const {
+    horizonS = 3600,
+    timeBudgetMs = 250,
+    defaultHeadwayS = 120,
+    nowEpochS = Math.floor(Date.now() / 1000),
+    previousSchedule = null,
+    fixedTrains = [],
+    sectionTables = buildSectionTables(trains.concat(fixedTrains)),
+  } = options;
+  const deadline = Date.now() + timeBudgetMs;
+
+  const activeTrains = trains.filter(bundle => !INACTIVE_STATUSES.includes(bundle.train.status));
+  const activeFixed = fixedTrains.filter(bundle => !INACTIVE_STATUSES.includes(bundle.train.status));
+  const fixedIds = new Set(activeFixed.map(bundle => bundle.train.train_id));
+
+  const sectionHeadway = sectionTables.headway;
+  const sectionSpeed = sectionTables.speed;
+
+  const occupancy: Record<string, Interval[]> = {};
+  // Earliest always-feasible entry per section: after every placed interval has
+  // ended and every placed entry is one headway back
+  const queueTail: Record<string, number> = {};
+  const addInterval = (sectionId: string, interval: Interval) => {
+    if (!occupancy[sectionId]) occupancy[sectionId] = [];
+    occupancy[sectionId].push(interval);
+    const headway = sectionHeadway[sectionId] ?? defaultHeadwayS;
+    queueTail[sectionId] = Math.max(
+      queueTail[sectionId] || 0,
+      interval.end,
+      interval.seeded ? 0 : interval.start + headway
+    );
+  };
+
+  // Checked every JOB_BUDGET_CHECK jobs while building, and per job while placing;
+  // once exceeded every remaining train is queued in O(1)
+  let budgetExceeded = false;
+  const checkBudget = () => {
+    if (!budgetExceeded && Date.now() > deadline) {
+      budgetExceeded = true;
+      console.warn(`Schedule solver exceeded ${timeBudgetMs}ms budget, queueing remaining trains`);
+    }
+    return budgetExceeded;
+  };
+
+  // Build one entry job per train and seed the sections they currently occupy
+  const jobs: Job[] = activeTrains.concat(activeFixed).map((bundle, i) => {
+    if (i % JOB_BUDGET_CHECK === 0) checkBudget();
+    const train = bundle.train;
+    const currentSection = train.current_location?.section_id || 'SEC_1';
+    const lengthM = (topology.sectionGraph[currentSection]?.length_km ?? bundle.section?.length_km ?? 0) * 1000;
+    const positionM = train.current_location?.position_m || 0;
+    const remainingM = train.direction === 'backward' ? positionM : lengthM - positionM;
+    const speed = Math.min(train.max_speed_kmh || DEFAULT_SPEED_KMH, sectionSpeed[currentSection] || Infinity);
+    const exitOffset = Math.round(travelTime(remainingM, speed));
+
+    const slot = topology.sectionIndex.get(currentSection);
+    const neighbours = slot === undefined ? [] : train.direction === 'backward' ? topology.prev[slot] : topology.next[slot];
+    const nextSection = neighbours.length > 0 ? topology.sections[neighbours[0]].section_id : undefined;
+    const targetSection = nextSection || currentSection;
+    const targetSpeed = Math.min(train.max_speed_kmh || DEFAULT_SPEED_KMH, sectionSpeed[targetSection] || Infinity);
+    const traversal = nextSection
+      ? Math.round(travelTime((topology.sectionGraph[nextSection]?.length_km || 0) * 1000, targetSpeed))
+      : 0;
+
+    // Trains on terminal sections still hold them until they reach the end
+    addInterval(currentSection, { start: 0, end: exitOffset, trainId: train.train_id, seeded: true });
+
+    const previous = previousSchedule?.schedule?.[train.train_id];
+    const hint = previous && previous.target_section === targetSection
+      ? previous.entry_epoch_s - nowEpochS
+      : null;
+
+    return {
+      trainId: train.train_id,
+      priority: train.priority || 1,
+      status: train.status,
+      targetSection,
+      earliest: nextSection ? exitOffset : 0,
+      traversal,
+      hint,
+      fixed: fixedIds.has(train.train_id),
+    };
+  }).filter(job => !job.fixed);
+
+  // Higher priority first; warm-started trains keep last cycle's relative order
+  jobs.sort((a, b) =>
+    b.priority - a.priority ||
+    (a.hint ?? Infinity) - (b.hint ?? Infinity) ||
+    a.earliest - b.earliest ||
+    a.trainId.localeCompare(b.trainId)
+  );
+
+  const schedule: Record<string, ScheduleEntry> = {};
+
+  jobs.forEach(job => {
+    const intervals = occupancy[job.targetSection] || [];
+    const capacity = topology.sectionCapacity[job.targetSection] || 1;
+    const headway = sectionHeadway[job.targetSection] ?? defaultHeadwayS;
+    const duration = Math.max(1, job.traversal);
+
+    let entry: number;
+    if (job.traversal === 0) {
+      // Train is on a terminal section with nothing to enter
+      entry = 0;
+    } else if (checkBudget()) {
+      // Out of budget: queue behind everything already placed, which is always feasible
+      entry = Math.max(job.earliest, queueTail[job.targetSection] || 0);
+    } else if (
+      job.hint !== null &&
+      job.hint >= job.earliest &&
+      isFeasible(intervals, capacity, headway, job.hint, duration)
+    ) {
+      entry = job.hint;
+    } else {
+      entry = findSlot(intervals, capacity, headway, job.earliest, duration);
+    }
+
+    // Entries past the horizon are kept (as holds beyond it) rather than clamped,
+    // so the schedule never stacks trains at the horizon boundary
+    entry = Math.ceil(entry);
+    if (job.traversal > 0) {
+      addInterval(job.targetSection, { start: entry, end: entry + duration, trainId: job.trainId });
+    }
+
+    const held = entry - job.earliest > HOLD_TOLERANCE_S || entry > horizonS;
+    schedule[job.trainId] = {
+      target_section: job.targetSection,
+      entry_offset_s: entry,
+      entry_epoch_s: nowEpochS + entry,
+      action: held ? `hold_until_${new Date((nowEpochS + entry) * 1000).toISOString()}` : 'proceed',
+      priority: job.priority,
+      status: held ? 'Waiting' : job.status || 'On time',
+    };
+  });
+
+  return {
+    now_epoch_s: nowEpochS,
+    horizon_s: horizonS,
+    snapshot_trains_considered: activeTrains.length,
+    schedule,
+  };
+};
+
+export default solveSchedule;
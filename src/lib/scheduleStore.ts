@@ -0,0 +1,495 @@
+import { OptimizationSchedule, ScheduleEntry } from '@/types';
+
+// Append-only, segmented log of optimization schedules (replaces one
+// train_schedule_<timestamp> entry per cycle). Records are compact JSON lines; each
+// record of the active segment is written to its own key, so an append costs one
+// record-sized write, and the segment is joined into a single key when it is sealed.
+// Segments rotate at a record count, byte size or time span, and a small index of
+// per-segment time bounds lets range queries skip segments without reading them.
+// Timestamps within a segment are loaded once into a sorted Float64Array and
+// binary-searched.
+
+export interface StorageLike {
+  getItem(key: string): string | null;
+  setItem(key: string, value: string): void;
+  removeItem(key: string): void;
+  // Only needed to migrate legacy per-cycle keys
+  readonly length?: number;
+  key?(index: number): string | null;
+}
+
+export interface ScheduleStoreOptions {
+  prefix?: string;
+  segmentRecords?: number;
+  segmentBytes?: number;
+  retentionS?: number;
+  maxSegments?: number;
+}
+
+export interface ScheduleQuery {
+  from?: number;
+  to?: number;
+  train_id?: string;
+}
+
+export interface StoredSchedule {
+  key: string;
+  schedule: OptimizationSchedule;
+  timestamp: string;
+}
+
+interface SegmentMeta {
+  id: number;
+  first_ts: number;
+  last_ts: number;
+  count: number;
+  bytes: number;
+  // Sealed segments are one newline-joined key; the active one has a key per record
+  sealed: boolean;
+}
+
+interface StoreIndex {
+  next_id: number;
+  segments: SegmentMeta[];
+}
+
+// [train_id, target_section, entry_offset_s, action, priority, status]
+type CompactEntry = [string, string, number, string, number, string];
+// [now_epoch_s, horizon_s, snapshot_trains_considered, entries]
+type CompactRecord = [number, number, number, CompactEntry[]];
+
+const encode = (schedule: OptimizationSchedule): string => {
+  const entries: CompactEntry[] = Object.entries(schedule.schedule || {}).map(([trainId, entry]) => [
+    trainId,
+    entry.target_section,
+    entry.entry_offset_s,
+    entry.action,
+    entry.priority,
+    entry.status,
+  ]);
+  const record: CompactRecord = [schedule.now_epoch_s, schedule.horizon_s, schedule.snapshot_trains_considered, entries];
+  return JSON.stringify(record);
+};
+
+const LEGACY_PREFIX = 'train_schedule_';
+
+const decode = (line: string, trainId?: string): OptimizationSchedule => {
+  const [now, horizon, considered, entries] = JSON.parse(line) as CompactRecord;
+  const schedule: Record<string, ScheduleEntry> = {};
+  entries.forEach(([id, targetSection, offset, action, priority, status]) => {
+    if (trainId && id !== trainId) return;
+    schedule[id] = {
+      target_section: targetSection,
+      entry_offset_s: offset,
+      entry_epoch_s: now + offset,
+      action,
+      priority,
+      status,
+    };
+  });
+  return { now_epoch_s: now, horizon_s: horizon, snapshot_trains_considered: considered, schedule };
+};
+
+// First index in the sorted array whose value is >= target
+const lowerBound = (values: Float64Array, target: number): number => {
+  let lo = 0;
+  let hi = values.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (values[mid] < target) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+};
+
+export class ScheduleStore {
+  private readonly storage: StorageLike;
+  private readonly prefix: string;
+  private readonly segmentRecords: number;
+  private readonly segmentBytes: number;
+  private readonly retentionS: number;
+  private readonly maxSegments: number;
+  private readonly segmentSpanS: number;
+  private index: StoreIndex;
+  private readonly timestampCache = new Map<number, Float64Array>();
+
+  constructor(storage: StorageLike, options: ScheduleStoreOptions = {}) {
+    this.storage = storage;
+    this.prefix = options.prefix ?? 'train_schedule_log';
+    this.segmentRecords = options.segmentRecords ?? 240;
+    // Bounds the cost of sealing a segment and keeps any one segment well below
+    // the ~5 MB localStorage quota
+    this.segmentBytes = options.segmentBytes ?? 256 * 1024;
+    this.retentionS = options.retentionS ?? 24 * 60 * 60;
+    this.maxSegments = options.maxSegments ?? 24;
+    // Segments cover at most an equal share of the retention window, so expired
+    // records are freed within one span of falling out of it
+    this.segmentSpanS = this.retentionS / Math.max(1, this.maxSegments);
+    this.index = this.readIndex();
+  }
+
+  // Returns false when the record could not be stored even after evicting old segments
+  append(schedule: OptimizationSchedule): boolean {
+    const line = encode(schedule);
+    const ts = schedule.now_epoch_s;
+
+    let active = this.index.segments[this.index.segments.length - 1];
+    if (!active || !this.fits(active, line) || ts < active.last_ts || ts - active.first_ts > this.segmentSpanS) {
+      active = this.startSegment(ts);
+    }
+
+    let stored = this.appendLine(active, line, ts);
+    if (!stored && active.count > 0) {
+      // The active segment cannot grow any further: seal it and continue in a new one
+      active = this.startSegment(ts);
+      stored = this.appendLine(active, line, ts);
+    }
+    if (!stored) {
+      this.index.segments.splice(this.index.segments.indexOf(active), 1);
+      console.warn('Schedule store full, dropping schedule record');
+    }
+
+    this.enforceRetention(ts);
+    this.writeIndex();
+    return stored;
+  }
+
+  // Move schedules saved one key per cycle (train_schedule_<timestamp>) into the log
+  migrateLegacy(): number {
+    const { storage } = this;
+    if (!storage.key || storage.length === undefined) return 0;
+
+    const keys: string[] = [];
+    for (let i = 0; i < storage.length; i++) {
+      const key = storage.key(i);
+      if (key && key.startsWith(LEGACY_PREFIX) && !key.startsWith(`${this.prefix}_`)) keys.push(key);
+    }
+    if (keys.length === 0) return 0;
+
+    const records: Array<{ ts: number; line: string }> = [];
+    keys.forEach(key => {
+      try {
+        const schedule = JSON.parse(storage.getItem(key) || '') as OptimizationSchedule;
+        if (typeof schedule.now_epoch_s === 'number') {
+          records.push({ ts: schedule.now_epoch_s, line: encode(schedule) });
+        }
+      } catch (error) {
+        console.warn(`Dropping unreadable legacy schedule ${key}:`, error);
+      }
+      // Free the quota before the records are rewritten as segments
+      storage.removeItem(key);
+    });
+    records.sort((a, b) => a.ts - b.ts);
+
+    // Build sealed segments in time order, then slot them in by start time
+    const migrated: SegmentMeta[] = [];
+    let current: { meta: SegmentMeta; lines: string[] } | null = null;
+    const flush = () => {
+      if (current && this.setWithEviction(this.segmentKey(current.meta.id), current.lines.join('\n'), null)) {
+        migrated.push(current.meta);
+      }
+      current = null;
+    };
+    records.forEach(({ ts, line }) => {
+      if (current && !this.fits(current.meta, line)) flush();
+      if (!current) {
+        current = {
+          meta: { id: this.index.next_id++, first_ts: ts, last_ts: ts, count: 0, bytes: 0, sealed: true },
+          lines: [],
+        };
+      }
+      current.lines.push(line);
+      current.meta.bytes += (current.meta.count > 0 ? 1 : 0) + line.length;
+      current.meta.count++;
+      current.meta.last_ts = ts;
+    });
+    flush();
+
+    const active = this.index.segments.pop();
+    this.index.segments = this.index.segments.concat(migrated).sort((a, b) => a.first_ts - b.first_ts);
+    if (active) this.index.segments.push(active);
+
+    const newest = this.index.segments[this.index.segments.length - 1];
+    if (newest) this.enforceRetention(Math.max(newest.last_ts, records[records.length - 1]?.ts ?? 0));
+    this.writeIndex();
+    return migrated.reduce((total, segment) => total + segment.count, 0);
+  }
+
+  // Visit schedules with from <= now_epoch_s <= to, oldest first, optionally for one
+  // train. Only segments overlapping the range are read; return false to stop early.
+  // Records older than the retention window are skipped even before their segment
+  // is dropped.
+  scan(query: ScheduleQuery, visit: (record: StoredSchedule) => boolean | void): void {
+    const { to = Infinity, train_id } = query;
+    const from = Math.max(query.from ?? -Infinity, this.retentionCutoff());
+    const segments = this.index.segments
+      .filter(segment => segment.count > 0 && segment.last_ts >= from && segment.first_ts <= to)
+      .sort((a, b) => a.first_ts - b.first_ts || a.id - b.id);
+
+    // Out-of-order appends start a new segment, so segments can overlap in time:
+    // each run of overlapping segments is merged by timestamp
+    for (let first = 0; first < segments.length;) {
+      let end = first + 1;
+      let runLast = segments[first].last_ts;
+      while (end < segments.length && segments[end].first_ts <= runLast) {
+        runLast = Math.max(runLast, segments[end].last_ts);
+        end++;
+      }
+
+      const cursors = segments.slice(first, end).map(segment => {
+        const lines = this.readLines(segment);
+        const timestamps = this.timestamps(segment.id, lines);
+        return { segment, lines, timestamps, i: lowerBound(timestamps, from) };
+      });
+      for (;;) {
+        let next = -1;
+        for (let c = 0; c < cursors.length; c++) {
+          const { i, timestamps } = cursors[c];
+          if (i >= timestamps.length || timestamps[i] > to) continue;
+          if (next === -1 || timestamps[i] < cursors[next].timestamps[cursors[next].i]) next = c;
+        }
+        if (next === -1) break;
+        const cursor = cursors[next];
+        const i = cursor.i++;
+
+        const schedule = decode(cursor.lines[i], train_id);
+        if (train_id && !schedule.schedule[train_id]) continue;
+        const keepGoing = visit({
+          key: `${this.segmentKey(cursor.segment.id)}:${i}`,
+          schedule,
+          timestamp: new Date(schedule.now_epoch_s * 1000).toISOString(),
+        });
+        if (keepGoing === false) return;
+      }
+      first = end;
+    }
+  }
+
+  query(query: ScheduleQuery = {}): StoredSchedule[] {
+    const results: StoredSchedule[] = [];
+    this.scan(query, record => {
+      results.push(record);
+    });
+    return results;
+  }
+
+  // Most recently appended schedule
+  latest(): OptimizationSchedule | null {
+    const segment = this.index.segments[this.index.segments.length - 1];
+    if (!segment || segment.count === 0) return null;
+    if (!segment.sealed) {
+      const line = this.storage.getItem(this.recordKey(segment, segment.count - 1));
+      return line ? decode(line) : null;
+    }
+    const data = this.storage.getItem(this.segmentKey(segment.id));
+    if (!data) return null;
+    return decode(data.slice(data.lastIndexOf('\n') + 1));
+  }
+
+  // Merge adjacent undersized sealed segments so queries touch fewer keys
+  compact(): void {
+    const segments = this.index.segments.slice();
+    const merged: SegmentMeta[] = [];
+    for (let i = 0; i < segments.length; i++) {
+      const segment = segments[i];
+      const previous = merged[merged.length - 1];
+      const isActive = i === segments.length - 1;
+      const mergeable = !isActive && previous && previous.sealed && segment.sealed &&
+        previous.count + segment.count <= this.segmentRecords &&
+        previous.bytes + segment.bytes + 1 <= this.segmentBytes &&
+        previous.last_ts <= segment.first_ts &&
+        segment.last_ts - previous.first_ts <= this.segmentSpanS;
+      const previousKey = previous ? this.segmentKey(previous.id) : '';
+      const key = this.segmentKey(segment.id);
+      if (
+        mergeable &&
+        this.setWithEviction(
+          previousKey,
+          [this.storage.getItem(previousKey), this.storage.getItem(key)].filter(Boolean).join('\n'),
+          previous
+        )
+      ) {
+        this.storage.removeItem(key);
+        this.timestampCache.delete(previous.id);
+        this.timestampCache.delete(segment.id);
+        previous.count += segment.count;
+        previous.bytes += segment.bytes + 1;
+        previous.last_ts = segment.last_ts;
+      } else {
+        merged.push(segment);
+      }
+    }
+    // Eviction during a merge may already have dropped some of these segments
+    this.index.segments = merged.filter(segment => this.index.segments.indexOf(segment) !== -1);
+    this.writeIndex();
+  }
+
+  private fits(segment: SegmentMeta, line: string): boolean {
+    return segment.count < this.segmentRecords &&
+      (segment.count === 0 || segment.bytes + 1 + line.length <= this.segmentBytes);
+  }
+
+  // Seal the active segment (compacting sealed ones) and open a new one
+  private startSegment(ts: number): SegmentMeta {
+    const active = this.index.segments[this.index.segments.length - 1];
+    if (active) this.seal(active);
+    if (this.index.segments.length > 1) this.compact();
+    const segment = { id: this.index.next_id++, first_ts: ts, last_ts: ts, count: 0, bytes: 0, sealed: false };
+    this.index.segments.push(segment);
+    return segment;
+  }
+
+  // One write of just the new record
+  private appendLine(segment: SegmentMeta, line: string, ts: number): boolean {
+    if (!this.setWithEviction(this.recordKey(segment, segment.count), line, segment)) return false;
+
+    segment.bytes += (segment.count > 0 ? 1 : 0) + line.length;
+    segment.count++;
+    segment.last_ts = ts;
+    this.timestampCache.delete(segment.id);
+    return true;
+  }
+
+  // Join the per-record keys into the segment key; a segment that cannot be sealed
+  // for lack of space stays readable as it is
+  private seal(segment: SegmentMeta): void {
+    if (segment.sealed || segment.count === 0) return;
+    const lines = this.readLines(segment);
+    if (!this.setWithEviction(this.segmentKey(segment.id), lines.join('\n'), segment)) return;
+    for (let i = 0; i < segment.count; i++) this.storage.removeItem(this.recordKey(segment, i));
+    segment.sealed = true;
+  }
+
+  private readLines(segment: SegmentMeta): string[] {
+    if (segment.sealed) return (this.storage.getItem(this.segmentKey(segment.id)) || '').split('\n');
+    const lines: string[] = [];
+    for (let i = 0; i < segment.count; i++) lines.push(this.storage.getItem(this.recordKey(segment, i)) || '');
+    return lines;
+  }
+
+  // Newest stored timestamp minus the retention window
+  private retentionCutoff(): number {
+    let newest = -Infinity;
+    this.index.segments.forEach(segment => {
+      if (segment.count > 0) newest = Math.max(newest, segment.last_ts);
+    });
+    return newest - this.retentionS;
+  }
+
+  // Drops every segment that ended before the cutoff, active or sealed, then the
+  // oldest segments beyond maxSegments
+  private enforceRetention(nowEpochS: number): void {
+    const cutoff = nowEpochS - this.retentionS;
+    this.index.segments
+      .filter(segment => segment.last_ts < cutoff)
+      .forEach(segment => this.dropSegment(segment));
+    while (this.index.segments.length > Math.max(1, this.maxSegments)) {
+      this.dropOldestSegment();
+    }
+  }
+
+  private dropOldestSegment(): void {
+    const segment = this.index.segments[0];
+    if (segment) this.dropSegment(segment);
+  }
+
+  private dropSegment(segment: SegmentMeta): void {
+    const position = this.index.segments.indexOf(segment);
+    if (position !== -1) this.index.segments.splice(position, 1);
+    if (segment.sealed) {
+      this.storage.removeItem(this.segmentKey(segment.id));
+    } else {
+      for (let i = 0; i < segment.count; i++) this.storage.removeItem(this.recordKey(segment, i));
+    }
+    this.timestampCache.delete(segment.id);
+  }
+
+  private timestamps(segmentId: number, lines: string[]): Float64Array {
+    let timestamps = this.timestampCache.get(segmentId);
+    if (!timestamps || timestamps.length !== lines.length) {
+      timestamps = new Float64Array(lines.length);
+      lines.forEach((line, i) => {
+        // The timestamp is the first field of every record
+        timestamps![i] = parseFloat(line.slice(1, line.indexOf(',')));
+      });
+      this.timestampCache.set(segmentId, timestamps);
+    }
+    return timestamps;
+  }
+
+  // Writes that hit the storage quota free the oldest segments (never `keep`) and
+  // retry; returns false once nothing else can be freed
+  private setWithEviction(key: string, value: string, keep: SegmentMeta | null): boolean {
+    for (;;) {
+      try {
+        this.storage.setItem(key, value);
+        return true;
+      } catch (error) {
+        const oldest = this.index.segments[0];
+        const evictable = oldest && oldest !== keep && this.index.segments.length > 1;
+        if (!evictable) {
+          console.warn('Schedule store write failed:', error);
+          return false;
+        }
+        console.warn('Schedule store full, dropping oldest segment');
+        this.dropOldestSegment();
+      }
+    }
+  }
+
+  private segmentKey(id: number): string {
+    return `${this.prefix}_seg_${id}`;
+  }
+
+  private recordKey(segment: SegmentMeta, record: number): string {
+    return `${this.segmentKey(segment.id)}_${record}`;
+  }
+
+  private readIndex(): StoreIndex {
+    try {
+      const raw = this.storage.getItem(`${this.prefix}_index`);
+      if (raw) {
+        const index = JSON.parse(raw) as StoreIndex;
+        // Indexes written before byte-size rotation have no segment sizes, and
+        // before per-record appends every segment was a single key
+        index.segments.forEach(segment => {
+          if (segment.sealed === undefined) segment.sealed = true;
+          if (segment.bytes === undefined) {
+            segment.bytes = (this.storage.getItem(this.segmentKey(segment.id)) || '').length;
+          }
+        });
+        return index;
+      }
+    } catch (error) {
+      console.warn('Failed to read schedule store index:', error);
+    }
+    return { next_id: 0, segments: [] };
+  }
+
+  private writeIndex(): void {
+    const active = this.index.segments[this.index.segments.length - 1] || null;
+    // The index is tiny, but it still must not be the write that wedges the store
+    if (!this.setWithEviction(`${this.prefix}_index`, JSON.stringify(this.index), active)) {
+      console.warn('Failed to write schedule store index');
+    }
+  }
+}
+
+let browserStore: ScheduleStore | null = null;
+
+// Shared store backed by localStorage; null during SSR
+export const getScheduleStore = (): ScheduleStore | null => {
+  if (typeof window === 'undefined' || !window.localStorage) return null;
+  if (!browserStore) {
+    browserStore = new ScheduleStore(window.localStorage);
+    try {
+      const migrated = browserStore.migrateLegacy();
+      if (migrated > 0) console.log(`Migrated ${migrated} legacy schedules into the schedule log`);
+    } catch (error) {
+      console.warn('Failed to migrate legacy schedules:', error);
+    }
+  }
+  return browserStore;
+};
+
+export default getScheduleStore;
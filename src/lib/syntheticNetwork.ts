@@ -0,0 +1,179 @@
+import { TrainBundle } from '@/types';
+import { TopologyDefinition, TopologySectionDefinition } from '@/lib/topology';
+
+// Seeded generator for synthetic networks and /api/train-data payloads, used by the
+// benchmark harness to exercise the decision pipeline beyond the 6-section demo line.
+// The same seed and sizes always produce the same topology and trains.
+
+export interface SyntheticNetworkOptions {
+  trains: number;
+  sections?: number;
+  seed?: number;
+}
+
+export interface SyntheticNetwork {
+  topology: TopologyDefinition;
+  trains: TrainBundle[];
+}
+
+// mulberry32: small, fast, deterministic PRNG
+export const createRandom = (seed: number): (() => number) => {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+};
+
+const TRAIN_TYPES: Array<{ type: TrainBundle['train']['type']; priority: number; speed: number; length: number }> = [
+  { type: 'Express', priority: 5, speed: 160, length: 200 },
+  { type: 'High-Speed', priority: 5, speed: 220, length: 250 },
+  { type: 'Local', priority: 3, speed: 120, length: 150 },
+  { type: 'Freight', priority: 2, speed: 100, length: 500 },
+];
+
+const STATUSES = ['On time', 'On time', 'On time', 'Delayed', 'Waiting', 'Arrived', 'Cancelled'];
+const CORRIDOR_LENGTH = 12;
+
+const pad = (value: number, width: number) => `${'0'.repeat(width)}${value}`.slice(-width);
+
+// Corridors of chained sections with a mix of single, double and triple track;
+// each corridor also gets a single-track bypass from its first station to its midpoint.
+export const generateTopology = (sectionCount: number, seed = 1): TopologyDefinition => {
+  const random = createRandom(seed);
+  const sections: TopologySectionDefinition[] = [];
+  const width = String(sectionCount).length;
+  let station = 0;
+
+  while (sections.length < sectionCount) {
+    const corridorLength = Math.min(CORRIDOR_LENGTH, sectionCount - sections.length);
+    const corridorStart = sections.length;
+    const startStation = station;
+
+    for (let i = 0; i < corridorLength; i++) {
+      const roll = random();
+      const capacity = roll < 0.4 ? 1 : roll < 0.85 ? 2 : 3;
+      const index = sections.length + 1;
+      sections.push({
+        section_id: `SEC_${pad(index, width)}`,
+        start_station: `STN_${station}`,
+        end_station: `STN_${station + 1}`,
+        length_km: Math.round((3 + random() * 12) * 10) / 10,
+        capacity,
+        track_type: capacity === 1 ? 'single' : 'double',
+        next: i < corridorLength - 1 ? [`SEC_${pad(index + 1, width)}`] : [],
+      });
+      station++;
+    }
+    station++;
+
+    // Bypass from the start of the corridor to its midpoint, when there is room
+    if (corridorLength >= 4 && sections.length < sectionCount) {
+      const index = sections.length + 1;
+      const mid = corridorStart + Math.floor(corridorLength / 2);
+      sections.push({
+        section_id: `SEC_${pad(index, width)}`,
+        start_station: `STN_${startStation}`,
+        end_station: sections[mid].start_station,
+        length_km: Math.round((8 + random() * 10) * 10) / 10,
+        capacity: 1,
+        track_type: 'single',
+        next: [sections[mid].section_id],
+        note: 'bypass route',
+      });
+    }
+  }
+
+  return { sections };
+};
+
+export const generateTrainBundles = (topology: TopologyDefinition, trainCount: number, seed = 1): TrainBundle[] => {
+  const random = createRandom(seed ^ 0x9e3779b9);
+  const sections = topology.sections;
+  const width = String(trainCount).length;
+  const baseTime = Date.UTC(2025, 8, 23, 6, 0, 0);
+  const bundles: TrainBundle[] = [];
+
+  for (let i = 0; i < trainCount; i++) {
+    const section = sections[Math.floor(random() * sections.length)];
+    const kind = TRAIN_TYPES[Math.floor(random() * TRAIN_TYPES.length)];
+    const status = STATUSES[Math.floor(random() * STATUSES.length)];
+    const trainId = `TR${pad(i + 1, width)}`;
+    const departure = new Date(baseTime + Math.floor(random() * 4 * 3600) * 1000).toISOString();
+    const delay = status === 'Delayed' ? Math.floor(random() * 30) + 1 : 0;
+    const sectionSpeed = section.capacity === 1 ? 100 : 140;
+
+    bundles.push({
+      train: {
+        train_id: trainId,
+        type: kind.type,
+        priority: kind.priority,
+        max_speed_kmh: kind.speed,
+        length_m: kind.length,
+        direction: random() < 0.8 ? 'forward' : 'backward',
+        destination_station: section.end_station,
+        current_location: {
+          section_id: section.section_id,
+          position_m: Math.floor(random() * section.length_km * 1000),
+        },
+        status,
+        actual_departure: departure,
+        actual_arrival: status === 'Arrived' ? departure : null,
+        journey_count: 1,
+      },
+      section: {
+        section_id: section.section_id,
+        start_station: section.start_station,
+        end_station: section.end_station,
+        length_km: section.length_km,
+        capacity: section.capacity,
+        max_speed_kmh: sectionSpeed,
+        track_type: section.capacity === 1 ? 'single' : 'double',
+        is_disrupted: random() < 0.02,
+        occupancy_count: 0,
+      },
+      signal: {
+        block_id: `BLK_${section.section_id.slice(4)}`,
+        section_id: section.section_id,
+        occupancy_status: 'occupied',
+        occupying_trains: 0,
+        signal_type: random() < 0.8 ? 'automatic' : 'manual',
+        headway_time_s: section.capacity === 1 ? 180 : 90,
+        priority_override: false,
+      },
+      event: {
+        event_type: delay > 0 ? 'delay' : 'departure',
+        train_id: trainId,
+        section_id: section.section_id,
+        timestamp: departure,
+        disruption_details: null,
+        delay_duration_min: delay,
+      },
+    });
+  }
+
+  // Fill in per-section occupancy now that every train has been placed
+  const occupancy: Record<string, number> = {};
+  bundles.forEach(bundle => {
+    const id = bundle.section.section_id;
+    occupancy[id] = (occupancy[id] || 0) + 1;
+  });
+  bundles.forEach(bundle => {
+    bundle.section.occupancy_count = occupancy[bundle.section.section_id];
+    bundle.signal.occupying_trains = occupancy[bundle.section.section_id];
+  });
+
+  return bundles;
+};
+
+// Roughly five trains per section unless a section count is given
+export const generateSyntheticNetwork = ({ trains, sections, seed = 1 }: SyntheticNetworkOptions): SyntheticNetwork => {
+  const sectionCount = sections ?? Math.max(6, Math.ceil(trains / 5));
+  const topology = generateTopology(sectionCount, seed);
+  return { topology, trains: generateTrainBundles(topology, trains, seed) };
+};
+
+export default generateSyntheticNetwork;
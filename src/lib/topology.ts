@@ -0,0 +1,90 @@
+import topologyDefinition from './topology.json';
+
+// Network topology loaded from a JSON definition and precomputed into
+// integer-indexed adjacency and reverse-adjacency tables.
+
+export interface TopologySectionDefinition {
+  section_id: string;
+  start_station: string;
+  end_station: string;
+  length_km: number;
+  capacity: number;
+  track_type: string;
+  next: string[];
+  note?: string;
+}
+
+export interface TopologyDefinition {
+  sections: TopologySectionDefinition[];
+}
+
+export interface SectionGraphEntry {
+  next: string[];
+  stations: string[];
+  length_km: number;
+}
+
+export interface Topology {
+  sections: TopologySectionDefinition[];
+  // section_id -> slot in the arrays below
+  sectionIndex: Map<string, number>;
+  capacity: Int32Array;
+  lengthKm: Float64Array;
+  next: number[][];
+  prev: number[][];
+  // Keyed views matching the shape used by decision_taker.py
+  sectionCapacity: Record<string, number>;
+  sectionGraph: Record<string, SectionGraphEntry>;
+}
+
+export const loadTopology = (definition: TopologyDefinition): Topology => {
+  const sections = definition.sections;
+  const count = sections.length;
+  const sectionIndex = new Map<string, number>();
+  sections.forEach((section, slot) => sectionIndex.set(section.section_id, slot));
+
+  const capacity = new Int32Array(count);
+  const lengthKm = new Float64Array(count);
+  const next: number[][] = [];
+  const prev: number[][] = [];
+  const sectionCapacity: Record<string, number> = {};
+  const sectionGraph: Record<string, SectionGraphEntry> = {};
+
+  for (let slot = 0; slot < count; slot++) {
+    next.push([]);
+    prev.push([]);
+  }
+
+  sections.forEach((section, slot) => {
+    capacity[slot] = section.capacity || 1;
+    lengthKm[slot] = section.length_km;
+    section.next.forEach(nextId => {
+      const nextSlot = sectionIndex.get(nextId);
+      if (nextSlot === undefined) {
+        throw new Error(`Topology section ${section.section_id} links to unknown section ${nextId}`);
+      }
+      next[slot].push(nextSlot);
+      prev[nextSlot].push(slot);
+    });
+    sectionCapacity[section.section_id] = capacity[slot];
+    sectionGraph[section.section_id] = {
+      next: section.next,
+      stations: [section.start_station, section.end_station],
+      length_km: section.length_km,
+    };
+  });
+
+  return { sections, sectionIndex, capacity, lengthKm, next, prev, sectionCapacity, sectionGraph };
+};
+
+// Human-readable network summary used in the LLM prompt
+export const describeTopology = (topology: Topology): string =>
+  topology.sections.map(section => {
+    const note = section.note ? `, ${section.note}` : '';
+    return `- ${section.section_id}: ${section.start_station}→${section.end_station} ` +
+      `(${section.length_km.toFixed(1)}km, capacity: ${section.capacity}, ${section.track_type} track${note})`;
+  }).join('\n');
+
+export const defaultTopology = loadTopology(topologyDefinition as TopologyDefinition);
+
+export default defaultTopology;
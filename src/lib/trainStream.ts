@@ -0,0 +1,182 @@
+import { TrainBundle } from '@/types';
+import { optimizationMetrics } from '@/lib/metrics';
+
+// Client for the /ws/train-data delta stream. The server sends one snapshot and
+// then sequence-numbered per-train deltas; a delta whose base_seq does not match
+// the last applied seq means messages were lost, so the client asks for a resync.
+// See src/api/optimization-endpoints.ts for the message format.
+
+export type TrainStreamMessage =
+  | { type: 'snapshot'; seq: number; payload: TrainBundle[] }
+  | { type: 'delta'; seq: number; base_seq: number; upserts: TrainBundle[]; removed: string[] };
+
+export interface TrainStreamUpdate {
+  trains: TrainBundle[];
+  upserts: TrainBundle[];
+  removed: string[];
+  snapshot: boolean;
+}
+
+type Listener = (update: TrainStreamUpdate) => void;
+
+const MAX_RECONNECT_DELAY_MS = 30000;
+const SOCKET_OPEN = 1; // WebSocket.OPEN, without touching the global during SSR
+
+export const toWebSocketUrl = (apiBaseUrl: string): string =>
+  `${apiBaseUrl.replace(/^http/, 'ws').replace(/\/$/, '')}/ws/train-data`;
+
+export class TrainDataStream {
+  private readonly url: string;
+  private socket: WebSocket | null = null;
+  private readonly listeners = new Set<Listener>();
+  private readonly trains = new Map<string, TrainBundle>();
+  private trainList: TrainBundle[] | null = null;
+  private lastSeq = -1;
+  private synced = false;
+  private reconnectDelay = 1000;
+  private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+
+  constructor(url: string) {
+    this.url = url;
+  }
+
+  // True once a snapshot has been applied and the socket is still open
+  get isLive(): boolean {
+    return this.synced && this.socket?.readyState === SOCKET_OPEN;
+  }
+
+  get sequence(): number {
+    return this.lastSeq;
+  }
+
+  getSnapshot(): TrainBundle[] {
+    if (!this.trainList) {
+      this.trainList = Array.from(this.trains.values());
+    }
+    return this.trainList;
+  }
+
+  subscribe(listener: Listener): () => void {
+    this.listeners.add(listener);
+    if (this.listeners.size === 1) {
+      this.connect();
+    } else if (this.synced) {
+      listener({ trains: this.getSnapshot(), upserts: [], removed: [], snapshot: true });
+    }
+    return () => {
+      this.listeners.delete(listener);
+      if (this.listeners.size === 0) {
+        this.close();
+      }
+    };
+  }
+
+  private connect(): void {
+    if (typeof WebSocket === 'undefined' || this.socket) return;
+
+    const socket = new WebSocket(this.url);
+    this.socket = socket;
+
+    socket.onopen = () => {
+      console.log(`Train data stream connected: ${this.url}`);
+      this.reconnectDelay = 1000;
+    };
+
+    socket.onmessage = (event: MessageEvent) => {
+      try {
+        if (typeof event.data === 'string') {
+          optimizationMetrics.observePayload('stream_message', event.data.length);
+        }
+        this.handleMessage(JSON.parse(event.data) as TrainStreamMessage);
+      } catch (error) {
+        console.error('Invalid train stream message:', error);
+        this.requestResync();
+      }
+    };
+
+    socket.onclose = () => {
+      this.socket = null;
+      this.synced = false;
+      if (this.listeners.size > 0) {
+        console.warn(`Train data stream closed, reconnecting in ${this.reconnectDelay}ms`);
+        this.reconnectTimer = setTimeout(() => {
+          this.reconnectTimer = null;
+          this.connect();
+        }, this.reconnectDelay);
+        this.reconnectDelay = Math.min(this.reconnectDelay * 2, MAX_RECONNECT_DELAY_MS);
+      }
+    };
+
+    socket.onerror = () => {
+      console.warn('Train data stream error');
+    };
+  }
+
+  private close(): void {
+    if (this.reconnectTimer) {
+      clearTimeout(this.reconnectTimer);
+      this.reconnectTimer = null;
+    }
+    if (this.socket) {
+      this.socket.onclose = null;
+      this.socket.close();
+      this.socket = null;
+    }
+    this.synced = false;
+  }
+
+  private handleMessage(message: TrainStreamMessage): void {
+    if (message.type === 'snapshot') {
+      this.trains.clear();
+      message.payload.forEach(bundle => this.trains.set(bundle.train.train_id, bundle));
+      this.lastSeq = message.seq;
+      this.synced = true;
+      this.trainList = null;
+      this.emit({ trains: this.getSnapshot(), upserts: message.payload, removed: [], snapshot: true });
+      return;
+    }
+
+    if (!this.synced) return;
+
+    // Deltas already covered by the current state can be dropped
+    if (message.seq <= this.lastSeq) return;
+
+    if (message.base_seq !== this.lastSeq) {
+      console.warn(`Train stream gap: expected base ${this.lastSeq}, got ${message.base_seq}`);
+      this.requestResync();
+      return;
+    }
+
+    message.upserts.forEach(bundle => this.trains.set(bundle.train.train_id, bundle));
+    message.removed.forEach(trainId => this.trains.delete(trainId));
+    this.lastSeq = message.seq;
+    this.trainList = null;
+    this.emit({ trains: this.getSnapshot(), upserts: message.upserts, removed: message.removed, snapshot: false });
+  }
+
+  private requestResync(): void {
+    this.synced = false;
+    if (this.socket?.readyState === SOCKET_OPEN) {
+      this.socket.send(JSON.stringify({ type: 'resync', last_seq: this.lastSeq }));
+    }
+  }
+
+  private emit(update: TrainStreamUpdate): void {
+    this.listeners.forEach(listener => listener(update));
+  }
+}
+
+// One shared stream per backend so every hook reuses the same socket
+const streams = new Map<string, TrainDataStream>();
+
+export const getTrainStream = (apiBaseUrl: string): TrainDataStream => {
+  const url = toWebSocketUrl(apiBaseUrl);
+  let stream = streams.get(url);
+  if (!stream) {
+    stream = new TrainDataStream(url);
+    streams.set(url, stream);
+  }
+  return stream;
+};
+
+export default getTrainStream;
@@ -53,6 +53,17 @@ export interface HealthResponse {
   active_trains: number;
   active_disruptions: number;
   disrupted_sections: string[];
+  optimization?: OptimizationHealth;
+}
+
+export interface OptimizationHealth {
+  cycles_total: number;
+  skipped_cycles_total: number;
+  llm_fallbacks_total: number;
+  llm_parse_failures_total: number;
+  last_cycle_at: string | null;
+  last_cycle_trains: number;
+  stages: Record<string, { count: number; p50_ms: number; p99_ms: number }>;
 }
 
 export interface TrainState {
@@ -72,6 +83,15 @@ export interface Disruption {
   estimated_end_time: string;
   description: string;
   affected_trains: string[];
+  reroute_options?: RerouteOption[];
+}
+
+export interface RerouteOption {
+  from_station: string;
+  to_station: string;
+  sections: string[];
+  length_km: number;
+  train_ids: string[];
 }
 
 export interface OptimizationResult {
@@ -122,4 +142,30 @@ export interface ApiResponse<T> {
   timestamp: string;
   status: "success" | "error";
   message?: string;
-}
\ No newline at end of file
+}
+export interface Conflict {
+  type: string;
+  section: string;
+  capacity?: number;
+  current_trains?: string[];
+  occupied_by?: string[];
+  approaching?: string[];
+  time_to_conflict_s?: number;
+  severity: string;
+}
+
+export interface ScheduleEntry {
+  target_section: string;
+  entry_offset_s: number;
+  entry_epoch_s: number;
+  action: string;
+  priority: number;
+  status: string;
+}
+
+export interface OptimizationSchedule {
+  now_epoch_s: number;
+  horizon_s: number;
+  snapshot_trains_considered: number;
+  schedule: Record<string, ScheduleEntry>;
+}
@@ -0,0 +1,32 @@
+import { loadTopology, Topology } from '@/lib/topology';
+import { solveSchedule } from '@/lib/scheduleSolver';
+import { RegionWorkerRequest, RegionWorkerResponse } from '@/lib/regionWorkerPool';
+
+// Runs one region batch of the partitioned solver (see networkPartition.ts).
+// The topology is only posted when it changes and is kept loaded between jobs.
+
+const ctx = self as unknown as {
+  onmessage: ((event: MessageEvent<RegionWorkerRequest>) => void) | null;
+  postMessage: (message: RegionWorkerResponse) => void;
+};
+
+let topology: Topology | null = null;
+let topologyVersion = 0;
+
+ctx.onmessage = event => {
+  const { id, trains, options } = event.data;
+  try {
+    if (event.data.topology) {
+      topology = loadTopology(event.data.topology);
+      topologyVersion = event.data.topologyVersion;
+    }
+    if (!topology || topologyVersion !== event.data.topologyVersion) {
+      throw new Error('Region solver worker has no topology loaded');
+    }
+    ctx.postMessage({ id, schedule: solveSchedule(trains, topology, options) });
+  } catch (error) {
+    ctx.postMessage({ id, error: error instanceof Error ? error.message : String(error) });
+  }
+};
+
+export {};